@@ -1,59 +1,104 @@
 """Configuration management for the XN Mental Health Chatbot."""
 
 import os
-from typing import Optional
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Optional
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+@lru_cache(maxsize=1)
+def _env() -> Dict[str, str]:
+    """Load the .env file once and return a snapshot of the environment.
 
+    Tests that need a fresh read should call ``_env.cache_clear()`` (and
+    ``get_config.cache_clear()``) after changing the environment.
+    """
+    load_dotenv()
+    return dict(os.environ)
+
+@dataclass(slots=True)
 class Config:
-    """Application configuration settings."""
-    
+    """Application configuration settings.
+
+    Environment-backed settings are read from the cached ``_env()``
+    snapshot. The instance is left mutable because the demo scripts
+    inject an API key and toggle ``ENABLE_LLM`` at runtime.
+    """
+
     # API Keys (optional)
-    OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
-    GEMINI_API_KEY: Optional[str] = os.getenv("GEMINI_API_KEY")
-    
+    OPENAI_API_KEY: Optional[str] = field(init=False)
+    GEMINI_API_KEY: Optional[str] = field(init=False)
+
     # Application Settings
     APP_TITLE: str = "MindBridge Care - Mental Health Support"
     APP_DESCRIPTION: str = "Personalized mental health guidance for college students"
-    
+
     # Crisis Contact Information
     CRISIS_HOTLINE: str = "988 (Suicide & Crisis Lifeline)"
     NORTHEASTERN_COUNSELING: str = "(617) 373-2772"
     EMERGENCY_NUMBER: str = "911"
-    
+
     # Logging Configuration
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FILE: str = os.getenv("LOG_FILE", "xn_chatbot.log")
-    
+    LOG_LEVEL: str = field(init=False)
+    LOG_FILE: str = field(init=False)
+
     # LLM Configuration
-    DEFAULT_MODEL: str = os.getenv("DEFAULT_MODEL", "gpt-3.5-turbo")
-    MAX_TOKENS: int = int(os.getenv("MAX_TOKENS", "500"))
-    TEMPERATURE: float = float(os.getenv("TEMPERATURE", "0.7"))
-    
+    DEFAULT_MODEL: str = field(init=False)
+    MAX_TOKENS: int = field(init=False)
+    TEMPERATURE: float = field(init=False)
+    LLM_CACHE_TTL_SECONDS: int = 3600
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+    # Process-wide cap on in-flight LLM calls, shared by every session
+    LLM_MAX_CONCURRENCY: int = 4
+
     # Session Configuration
     MAX_CONVERSATION_LENGTH: int = 50
     SESSION_TIMEOUT_MINUTES: int = 30
-    
+
     # Feature Flags
-    ENABLE_LLM: bool = os.getenv("ENABLE_LLM", "true").lower() == "true"
-    ENABLE_LOGGING: bool = os.getenv("ENABLE_LOGGING", "true").lower() == "true"
-    DEBUG_MODE: bool = os.getenv("DEBUG_MODE", "false").lower() == "true"
-    
-    @classmethod
-    def has_llm_api_key(cls) -> bool:
+    ENABLE_LLM: bool = field(init=False)
+    ENABLE_LOGGING: bool = field(init=False)
+    DEBUG_MODE: bool = field(init=False)
+
+    def __post_init__(self):
+        env = _env()
+
+        self.OPENAI_API_KEY = env.get("OPENAI_API_KEY")
+        self.GEMINI_API_KEY = env.get("GEMINI_API_KEY")
+
+        self.LOG_LEVEL = env.get("LOG_LEVEL", "INFO")
+        self.LOG_FILE = env.get("LOG_FILE", "xn_chatbot.log")
+
+        self.DEFAULT_MODEL = env.get("DEFAULT_MODEL", "gpt-3.5-turbo")
+        self.MAX_TOKENS = int(env.get("MAX_TOKENS", "500"))
+        self.TEMPERATURE = float(env.get("TEMPERATURE", "0.7"))
+
+        self.ENABLE_LLM = env.get("ENABLE_LLM", "true").lower() == "true"
+        self.ENABLE_LOGGING = env.get("ENABLE_LOGGING", "true").lower() == "true"
+        self.DEBUG_MODE = env.get("DEBUG_MODE", "false").lower() == "true"
+
+    def has_llm_api_key(self) -> bool:
         """Check if any LLM API key is available."""
-        return bool(cls.OPENAI_API_KEY or cls.GEMINI_API_KEY)
-    
-    @classmethod
-    def get_available_llm_provider(cls) -> Optional[str]:
+        return bool(self.OPENAI_API_KEY or self.GEMINI_API_KEY)
+
+    def get_available_llm_provider(self) -> Optional[str]:
         """Get the first available LLM provider."""
-        if cls.OPENAI_API_KEY:
+        if self.OPENAI_API_KEY:
             return "openai"
-        elif cls.GEMINI_API_KEY:
+        elif self.GEMINI_API_KEY:
             return "gemini"
         return None
 
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Get the shared configuration instance."""
+    return Config()
+
 # Global configuration instance
-config = Config()
\ No newline at end of file
+config = get_config()
+
+# Settings that never change after startup, bound as plain module globals
+# so hot paths can import them directly.
+MAX_TOKENS: int = config.MAX_TOKENS
+TEMPERATURE: float = config.TEMPERATURE
+DEFAULT_MODEL: str = config.DEFAULT_MODEL
@@ -1,68 +1,235 @@
 """Conversation flow management for the mental health chatbot."""
 
-import uuid
+import atexit
+import itertools
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
+from secrets import token_hex
+from typing import Iterable, List, Dict, Optional, Tuple
 from data_models import (
     ConversationSession, UserMessage, BotResponse, SeverityLevel
 )
-from domain_logic import mental_health_matcher
-from crisis_handler import crisis_handler
-from llm_client import llm_client
 from utils.logger import logger
 from config import config
 from provider_recommendation_flow import provider_flow
 
+# The analysis and LLM modules build sizeable tables (and may initialise an
+# API client) on import, so they are loaded on first use rather than at
+# module import. Session bookkeeping paths never touch them.
+@lru_cache(maxsize=None)
+def _matcher():
+    from domain_logic import mental_health_matcher
+    return mental_health_matcher
+
+@lru_cache(maxsize=None)
+def _crisis_handler():
+    from crisis_handler import crisis_handler
+    return crisis_handler
+
+@lru_cache(maxsize=None)
+def _llm():
+    from llm_client import llm_client
+    return llm_client
+
+# One pool runs LLM round-trips for every manager so local work can proceed
+# while they are in flight. Its size deliberately throttles concurrent LLM
+# calls across all sessions (config.LLM_MAX_CONCURRENCY). It is created on
+# the first LLM-enabled turn and shut down at exit.
+@lru_cache(maxsize=None)
+def _llm_executor() -> ThreadPoolExecutor:
+    executor = ThreadPoolExecutor(max_workers=config.LLM_MAX_CONCURRENCY, thread_name_prefix="llm")
+    atexit.register(executor.shutdown)
+    return executor
+
+# Category-specific follow-up questions (static, shared by all sessions)
+_FOLLOW_UPS: Dict[str, Tuple[str, ...]] = {
+    'academic_stress': (
+        "What specific academic challenges are you facing?",
+        "How long have you been feeling this academic pressure?",
+        "Have you been able to talk to any professors or advisors about this?"
+    ),
+    'social_isolation': (
+        "How long have you been feeling lonely?",
+        "What kinds of social connections are you hoping to make?",
+        "Have you tried joining any clubs or activities on campus?"
+    ),
+    'cultural_adjustment': (
+        "What aspects of cultural adjustment are most challenging?",
+        "How long have you been away from home?",
+        "Have you connected with other international students?"
+    ),
+    'self_esteem': (
+        "What situations tend to trigger these feelings?",
+        "How do these feelings affect your daily life?",
+        "What usually helps you feel more confident?"
+    )
+}
+_FOLLOW_UP_KEYS = frozenset(_FOLLOW_UPS)
+
+# General follow-up questions used when no category-specific ones apply
+_GENERAL_FOLLOW_UPS: Tuple[str, ...] = (
+    "Would you like to talk more about what's been bothering you?",
+    "How long have you been feeling this way?",
+    "What kind of support do you think would be most helpful?",
+    "Have you been able to talk to anyone else about this?"
+)
+
+# Prioritize categories - more specific concerns first
+_CATEGORY_PRIORITY: Tuple[str, ...] = (
+    'social_isolation', 'cultural_adjustment', 'self_esteem', 'academic_stress'
+)
+
+_CATEGORY_RANK: Dict[str, int] = {category: rank for rank, category in enumerate(_CATEGORY_PRIORITY)}
+
+def _build_follow_up_combos() -> Dict[frozenset, Tuple[str, ...]]:
+    """Precompute the follow-up questions (max 2) for every set of known categories."""
+    combos = {}
+    for size in range(len(_FOLLOW_UPS) + 1):
+        for combo in itertools.combinations(_FOLLOW_UPS, size):
+            # Questions come from the highest priority category only
+            top = next((c for c in _CATEGORY_PRIORITY if c in combo), None)
+            questions = _FOLLOW_UPS[top] if top else _GENERAL_FOLLOW_UPS
+            combos[frozenset(combo)] = questions[:2]
+    return combos
+
+_FOLLOW_UP_COMBOS = _build_follow_up_combos()
+
+# Conversation topics with stage-specific follow-ups, checked in this order
+_CONTEXTUAL_TOPICS: Tuple[str, ...] = ('social_isolation', 'academic_stress')
+
+_EARLY_CONTEXTUAL_FOLLOW_UPS: Dict[str, Tuple[str, ...]] = {
+    'social_isolation': (
+        "What kinds of social connections are you hoping to make?",
+        "Have you tried joining any clubs or activities on campus?",
+        "What's been the hardest part about making friends?"
+    ),
+    'academic_stress': (
+        "What specific academic challenges are you facing?",
+        "How is this affecting your daily routine?",
+        "Have you been able to talk to any professors or advisors about this?"
+    )
+}
+
+_LATER_CONTEXTUAL_FOLLOW_UPS: Dict[str, Tuple[str, ...]] = {
+    'social_isolation': (
+        "What do you think would help you feel more connected?",
+        "Are there any activities or interests you'd like to explore with others?",
+        "Would you be interested in connecting with peer support groups?"
+    ),
+    'academic_stress': (
+        "What study strategies have you tried so far?",
+        "Would you be interested in academic coaching or tutoring resources?",
+        "How are you taking care of yourself during stressful times?"
+    )
+}
+
+# Used once every contextual question has already been asked
+_WRAP_UP_FOLLOW_UPS: Tuple[str, ...] = (
+    "How are you feeling about the resources I've shared?",
+    "What kind of support do you think would be most helpful right now?",
+    "Is there anything else you'd like to talk about?"
+)
+
+# Phrases indicating the user wants help finding a provider
+_PROVIDER_KEYWORDS: Tuple[str, ...] = (
+    "find provider", "find therapist", "find psychiatrist", "find counselor",
+    "help finding", "looking for", "recommend provider", "therapy near me",
+    "therapist near me", "mental health provider", "where can i find",
+    "help me find", "find a therapist", "find a provider", "find a counselor"
+)
+
+# All provider phrases compiled into one alternation so a single C-level
+# scan of the input replaces a substring search per phrase
+_PROVIDER_INTENT_PATTERN = re.compile("|".join(map(re.escape, _PROVIDER_KEYWORDS)))
+
+# Severity levels that switch conversation context and flag the user as high risk
+_HIGH_RISK_LEVELS = frozenset({SeverityLevel.HIGH, SeverityLevel.CRISIS})
+
+# Severity levels for which provider search is proactively offered
+_PROVIDER_OFFER_LEVELS = frozenset({SeverityLevel.MODERATE, SeverityLevel.HIGH})
+
+# Concern categories that always warrant a conversation context switch
+_MAJOR_CONCERNS = frozenset({'crisis', 'self_harm', 'suicidal_ideation'})
+
+def _build_response_type_table() -> Dict[Tuple[bool, SeverityLevel, bool], str]:
+    """Precompute the response type for every (crisis, severity, has recommendations) combination."""
+    table = {}
+    for requires_attention in (True, False):
+        for severity in SeverityLevel:
+            for has_recommendations in (True, False):
+                if requires_attention:
+                    response_type = "crisis"
+                elif severity is SeverityLevel.HIGH:
+                    response_type = "urgent_support"
+                elif has_recommendations:
+                    response_type = "resource_recommendation"
+                else:
+                    response_type = "general_support"
+                table[(requires_attention, severity, has_recommendations)] = response_type
+    return table
+
+_RESPONSE_TYPES = _build_response_type_table()
+
 class ConversationManager:
     """Manages conversation flow and session state."""
     
     def __init__(self):
         self.active_sessions: Dict[str, ConversationSession] = {}
-        self.welcome_messages = [
+        self._active_count = 0
+        # Guards changes to the session index and the active count; plain
+        # lookups stay lock-free since single dict reads are atomic
+        self._sessions_lock = threading.Lock()
+        
+        # Provider search state machine: step -> (handler, next step); None ends the flow
+        self._provider_steps = {
+            'location_collection': (provider_flow.process_location_response, 'insurance_collection'),
+            'insurance_collection': (provider_flow.process_insurance_response, 'care_type_collection'),
+            'care_type_collection': (provider_flow.process_care_type_response, 'specialties_collection'),
+            'specialties_collection': (provider_flow.process_specialties_response, 'final_preferences'),
+            'final_preferences': (provider_flow.process_final_preferences, None)
+        }
+        
+        # Recent AI responses keyed by (normalized input, severity, categories), LRU order
+        self._llm_response_cache: Dict[Tuple, Tuple[str, float]] = OrderedDict()
+        # LLM round-trips run on executor threads, so every cache access holds this
+        self._llm_cache_lock = threading.Lock()
+        self.welcome_messages = (
             "Hello! I'm here to help you navigate mental health resources and support. How are you feeling today?",
             "Hi there! I'm a mental health support assistant connected to MindBridge Care and Northeastern services. What's on your mind?",
             "Welcome! I'm here to listen and help connect you with the right mental health resources. How can I support you today?"
-        ]
-        
-        self.follow_up_questions = {
-            'academic_stress': [
-                "What specific academic challenges are you facing?",
-                "How long have you been feeling this academic pressure?",
-                "Have you been able to talk to any professors or advisors about this?"
-            ],
-            'social_isolation': [
-                "How long have you been feeling lonely?",
-                "What kinds of social connections are you hoping to make?",
-                "Have you tried joining any clubs or activities on campus?"
-            ],
-            'cultural_adjustment': [
-                "What aspects of cultural adjustment are most challenging?",
-                "How long have you been away from home?",
-                "Have you connected with other international students?"
-            ],
-            'self_esteem': [
-                "What situations tend to trigger these feelings?",
-                "How do these feelings affect your daily life?",
-                "What usually helps you feel more confident?"
-            ]
-        }
+        )
+        self._welcome_cycle = itertools.cycle(self.welcome_messages)
+        self._rng = random.Random()
+        
+        # Bind hot-path logging calls once
+        self._log_interaction = logger.log_user_interaction
+        self._log_crisis = logger.log_crisis_detection
+        
+        self.follow_up_questions = _FOLLOW_UPS
     
     def start_new_session(self) -> str:
         """Start a new conversation session."""
-        session_id = str(uuid.uuid4())
+        session_id = token_hex(16)
         session = ConversationSession(
             session_id=session_id,
             start_time=datetime.now()
         )
-        self.active_sessions[session_id] = session
+        with self._sessions_lock:
+            self.active_sessions[session_id] = session
+            self._active_count += 1
         
-        logger.log_user_interaction(session_id, "session_started")
+        self._log_interaction(session_id, "session_started")
         return session_id
     
     def get_welcome_message(self) -> str:
         """Get a welcome message for new users."""
-        import random
-        return random.choice(self.welcome_messages)
+        return next(self._welcome_cycle)
     
     def process_user_message(self, session_id: str, user_input: str) -> Tuple[str, bool]:
         """Process user message and generate appropriate response."""
@@ -71,12 +238,16 @@ class ConversationManager:
             session_id = self.start_new_session()
             session = self.active_sessions[session_id]
         
-        # Create user message
-        user_message = UserMessage(content=user_input)
+        # Create user message, sharing one timestamp across this turn's bookkeeping
+        now = datetime.now()
+        user_message = UserMessage(content=user_input, timestamp=now)
         
         # Analyze user input
-        conversation_history = [msg.content for msg in session.messages[-5:]]  # Last 5 messages
-        analysis = mental_health_matcher.analyze_user_input(user_input, conversation_history)
+        conversation_history = session.recent_contents  # Last 5 messages, read-only here
+        analysis = _matcher().analyze_user_input(user_input, conversation_history)
+        # Set view of the categories for the membership checks below; the
+        # list keeps its priority order for follow-ups and session context
+        analysis['categories_set'] = frozenset(analysis['categories'])
         
         # Update user message with analysis
         user_message.detected_keywords = analysis['keywords']
@@ -85,13 +256,24 @@ class ConversationManager:
         
         # Add to session
         session.messages.append(user_message)
-        session.identified_concerns.extend(analysis['categories'])
-        session.recommended_resources.extend([r.resource_id for r in analysis['recommendations']])
+        session.recent_contents.append(user_input)
+        
+        # Keep concerns/resources unique as they arrive; both draw from small
+        # fixed vocabularies, so the membership checks stay cheap
+        identified_concerns = session.identified_concerns
+        for category in analysis['categories']:
+            if category not in identified_concerns:
+                identified_concerns.append(category)
+        
+        recommended_resources = session.recommended_resources
+        for recommendation in analysis['recommendations']:
+            if recommendation.resource_id not in recommended_resources:
+                recommended_resources.append(recommendation.resource_id)
         
         # Handle crisis situations immediately
         if analysis['requires_immediate_attention']:
             session.crisis_flags.extend(analysis['crisis_assessment'].detected_indicators)
-            crisis_response = crisis_handler.generate_crisis_response(analysis['crisis_assessment'])
+            crisis_response = _crisis_handler().generate_crisis_response(analysis['crisis_assessment'])
             
             bot_response = BotResponse(
                 content=crisis_response,
@@ -100,25 +282,26 @@ class ConversationManager:
             )
             session.responses.append(bot_response)
             
-            logger.log_crisis_detection(session_id, analysis['severity'].value)
+            self._log_crisis(session_id, analysis['severity'].value)
             return crisis_response, True  # True indicates crisis situation
         
         # Check if user is asking for provider recommendations
-        provider_keywords = ["find provider", "find therapist", "find psychiatrist", "find counselor", 
-                           "help finding", "looking for", "recommend provider", "therapy near me",
-                           "therapist near me", "mental health provider", "where can i find",
-                           "help me find", "find a therapist", "find a provider", "find a counselor"]
-        
+        # (the lowercased input is also reused by the provider flow handlers)
         user_input_lower = user_input.lower()
-        wants_provider_search = any(keyword in user_input_lower for keyword in provider_keywords)
+        wants_provider_search = _PROVIDER_INTENT_PATTERN.search(user_input_lower) is not None
         
         # Also trigger provider search for moderate/high severity after initial assessment
         should_offer_providers = (
-            analysis['severity'] in [SeverityLevel.MODERATE, SeverityLevel.HIGH] and 
+            analysis['severity'] in _PROVIDER_OFFER_LEVELS and 
             len(session.messages) >= 2 and  # After some conversation
             not analysis['requires_immediate_attention']
         )
         
+        # Resolve the conversation context once per turn; it feeds the response
+        # body, the contextual recommendations and the follow-up questions
+        conversation_categories = self._get_conversation_context(session, analysis)
+        follow_up_questions = self._get_follow_up_questions(conversation_categories)
+        
         if wants_provider_search:
             # Start provider recommendation flow
             response_content = provider_flow.start_provider_search(session_id)
@@ -126,10 +309,12 @@ class ConversationManager:
             session.user_profile['provider_search_step'] = 'location_collection'
         elif session.user_profile.get('provider_search_active'):
             # Continue provider recommendation flow
-            response_content = self._handle_provider_search_flow(session_id, user_input, session)
+            response_content = self._handle_provider_search_flow(session_id, user_input, session, user_input_lower)
         else:
             # Generate regular response
-            response_content = self._generate_response(session, analysis)
+            response_content = self._generate_response(
+                session, analysis, conversation_categories, follow_up_questions
+            )
             
             # Offer provider search for appropriate cases
             if should_offer_providers and not session.user_profile.get('provider_search_offered'):
@@ -137,39 +322,56 @@ class ConversationManager:
                 session.user_profile['provider_search_offered'] = True
         
         # Create bot response
-        # Use conversation context for follow-up questions instead of re-analyzing
-        conversation_categories = self._get_conversation_context(session, analysis)
+        # Crisis turns returned early above, so only the non-crisis types remain
+        response_type = _RESPONSE_TYPES[(False, analysis['severity'], bool(analysis['recommendations']))]
+        
         bot_response = BotResponse(
             content=response_content,
-            response_type=self._determine_response_type(analysis),
+            response_type=response_type,
             recommended_resources=[r.resource_id for r in analysis['recommendations'][:3]],
-            follow_up_questions=self._get_follow_up_questions(conversation_categories)
+            follow_up_questions=follow_up_questions
         )
         
         session.responses.append(bot_response)
         
         # Update session metadata
-        self._update_session_metadata(session, analysis)
+        self._update_session_metadata(session, analysis, now)
         
         return response_content, False  # False indicates normal conversation
     
-    def _generate_response(self, session: ConversationSession, analysis: Dict) -> str:
+    def _generate_response(self, session: ConversationSession, analysis: Dict,
+                           conversation_categories: List[str], follow_up_questions: List[str]) -> str:
         """Generate appropriate response based on analysis."""
-        # Prepare context for LLM
-        context = mental_health_matcher.get_conversation_context(analysis)
-        
-        # Try to generate LLM response with debug info
-        llm_response, response_source = self._generate_llm_response_with_debug(analysis['original_input'], context)
+        matcher = _matcher()
+        llm_client = _llm()
+        
+        pending_llm_response = None
+        if config.ENABLE_LLM and llm_client.client:
+            # Reuse a recent AI answer when there is one; otherwise the network
+            # round-trip overlaps the recommendation work below
+            cache_key = self._llm_cache_key(analysis)
+            llm_response = self._get_cached_llm_response(cache_key)
+            response_source = "gemini"
+            if llm_response is None:
+                pending_llm_response = _llm_executor().submit(
+                    self._generate_and_cache_llm_response, analysis, cache_key
+                )
+        else:
+            # Rule-based responses don't use the LLM context, so skip building it
+            llm_response = llm_client._generate_fallback_response(analysis['original_input'])
+            response_source = "fallback"
         
         # Add resource recommendations based on conversation context
-        conversation_categories = self._get_conversation_context(session, analysis)
-        contextual_recommendations = mental_health_matcher.get_contextual_recommendations(
+        contextual_recommendations = matcher.get_contextual_recommendations(
             conversation_categories, analysis['severity']
         )
-        recommendations_text = mental_health_matcher.format_recommendations_for_display(
+        recommendations_text = matcher.format_recommendations_for_display(
             contextual_recommendations
         )
         
+        if pending_llm_response is not None:
+            llm_response, response_source = pending_llm_response.result()
+        
         # Add debug badge based on response source
         debug_badge = ""
         if config.DEBUG_MODE or True:  # Always show for now
@@ -191,17 +393,56 @@ class ConversationManager:
         
         # Add follow-up questions if appropriate
         # Use established conversation context instead of re-analyzing
-        conversation_categories = self._get_conversation_context(session, analysis)
-        follow_ups = self._get_contextual_follow_up_questions(session, conversation_categories, analysis)
+        follow_ups = self._get_contextual_follow_up_questions(
+            session, conversation_categories, analysis, follow_up_questions
+        )
         if follow_ups and len(session.messages) < 4:  # Allow more conversation turns
-            import random
-            follow_up = random.choice(follow_ups)
+            follow_up = self._rng.choice(follow_ups)
             full_response += f"\n\n{follow_up}"
         
         return full_response
     
+    def _llm_cache_key(self, analysis: Dict) -> Tuple:
+        """Build the LLM cache key: (normalized input, severity, categories)."""
+        return (
+            ' '.join(analysis['cleaned_input'].lower().split()),
+            analysis['severity'],
+            tuple(analysis['categories'])
+        )
+    
+    def _get_cached_llm_response(self, cache_key: Tuple) -> Optional[str]:
+        """Return a recent cached AI response, dropping it if it has expired."""
+        with self._llm_cache_lock:
+            cached = self._llm_response_cache.get(cache_key)
+            if cached is None:
+                return None
+            response, cached_at = cached
+            if time.monotonic() - cached_at < config.LLM_CACHE_TTL_SECONDS:
+                self._llm_response_cache.move_to_end(cache_key)
+                return response
+            del self._llm_response_cache[cache_key]
+            return None
+    
+    def _generate_and_cache_llm_response(self, analysis: Dict, cache_key: Tuple) -> Tuple[str, str]:
+        """Generate an LLM response for a cache miss and cache it if it came from the AI."""
+        # Prepare context for LLM
+        context = _matcher().get_conversation_context(analysis)
+        response, response_source = self._generate_llm_response_with_debug(analysis['original_input'], context)
+        
+        # Only cache genuine AI responses; fallbacks are cheap to rebuild
+        if response_source == "gemini":
+            with self._llm_cache_lock:
+                cache = self._llm_response_cache
+                cache[cache_key] = (response, time.monotonic())
+                cache.move_to_end(cache_key)
+                if len(cache) > config.LLM_CACHE_MAX_ENTRIES:
+                    cache.popitem(last=False)
+        
+        return response, response_source
+    
     def _generate_llm_response_with_debug(self, user_input: str, context: Dict) -> Tuple[str, str]:
         """Generate LLM response with debug information about the source."""
+        llm_client = _llm()
         try:
             # First try to detect what type of response we'll get
             if not config.ENABLE_LLM or not llm_client.client:
@@ -233,112 +474,43 @@ class ConversationManager:
             response = llm_client._generate_fallback_response(user_input, context)
             return response, "error"
     
-    def _determine_response_type(self, analysis: Dict) -> str:
-        """Determine the type of response based on analysis."""
-        if analysis['requires_immediate_attention']:
-            return "crisis"
-        elif analysis['severity'] == SeverityLevel.HIGH:
-            return "urgent_support"
-        elif analysis['recommendations']:
-            return "resource_recommendation"
-        else:
-            return "general_support"
-    
     def _get_follow_up_questions(self, categories: List[str]) -> List[str]:
         """Get appropriate follow-up questions based on categories."""
-        questions = []
-        
-        # Prioritize categories - more specific concerns first
-        category_priority = ['social_isolation', 'cultural_adjustment', 'self_esteem', 'academic_stress']
-        
-        # Sort categories by priority
-        prioritized_categories = []
-        for priority_cat in category_priority:
-            if priority_cat in categories:
-                prioritized_categories.append(priority_cat)
-        
-        # Add any remaining categories
-        for cat in categories:
-            if cat not in prioritized_categories:
-                prioritized_categories.append(cat)
-        
-        # Get questions from the highest priority category only
-        if prioritized_categories and prioritized_categories[0] in self.follow_up_questions:
-            questions = self.follow_up_questions[prioritized_categories[0]]
-        
-        # Add general follow-up questions if no specific ones found
-        general_questions = [
-            "Would you like to talk more about what's been bothering you?",
-            "How long have you been feeling this way?",
-            "What kind of support do you think would be most helpful?",
-            "Have you been able to talk to anyone else about this?"
-        ]
-        
-        if not questions:
-            questions = general_questions
-        
-        return questions[:2]  # Return max 2 questions
+        # Only categories with dedicated questions affect the result
+        return list(_FOLLOW_UP_COMBOS[_FOLLOW_UP_KEYS.intersection(categories)])
     
-    def _get_contextual_follow_up_questions(self, session: ConversationSession, categories: List[str], analysis: Dict) -> List[str]:
+    def _get_contextual_follow_up_questions(self, session: ConversationSession, categories: List[str], analysis: Dict,
+                                            base_questions: Optional[List[str]] = None) -> List[str]:
         """Get contextual follow-up questions that avoid repetition and build on the conversation."""
-        # Track what questions we've already asked
-        asked_questions = session.user_profile.get('asked_questions', set())
+        # Track what questions we've already asked (bounded by the fixed question pools)
+        asked_questions = session.user_profile.setdefault('asked_questions', set())
         
-        # Get base questions for the category
-        base_questions = self._get_follow_up_questions(categories)
+        # Get base questions for the category, unless the caller already has them
+        if base_questions is None:
+            base_questions = self._get_follow_up_questions(categories)
         
         # Add contextual questions based on conversation progress
-        contextual_questions = []
-        
-        # For social isolation conversations
-        if 'social_isolation' in categories:
-            if len(session.messages) == 2:  # First follow-up
-                contextual_questions.extend([
-                    "What kinds of social connections are you hoping to make?",
-                    "Have you tried joining any clubs or activities on campus?",
-                    "What's been the hardest part about making friends?"
-                ])
-            elif len(session.messages) >= 3:  # Later in conversation
-                contextual_questions.extend([
-                    "What do you think would help you feel more connected?",
-                    "Are there any activities or interests you'd like to explore with others?",
-                    "Would you be interested in connecting with peer support groups?"
-                ])
-        
-        # For academic stress conversations  
-        elif 'academic_stress' in categories:
-            if len(session.messages) == 2:
-                contextual_questions.extend([
-                    "What specific academic challenges are you facing?",
-                    "How is this affecting your daily routine?",
-                    "Have you been able to talk to any professors or advisors about this?"
-                ])
-            elif len(session.messages) >= 3:
-                contextual_questions.extend([
-                    "What study strategies have you tried so far?",
-                    "Would you be interested in academic coaching or tutoring resources?",
-                    "How are you taking care of yourself during stressful times?"
-                ])
+        contextual_questions: Tuple[str, ...] = ()
+        topic = next((c for c in _CONTEXTUAL_TOPICS if c in categories), None)
+        if topic:
+            message_count = len(session.messages)
+            if message_count == 2:  # First follow-up
+                contextual_questions = _EARLY_CONTEXTUAL_FOLLOW_UPS[topic]
+            elif message_count >= 3:  # Later in conversation
+                contextual_questions = _LATER_CONTEXTUAL_FOLLOW_UPS[topic]
         
         # Combine and filter out already asked questions
-        all_questions = base_questions + contextual_questions
-        available_questions = [q for q in all_questions if q not in asked_questions]
+        available_questions = [q for q in itertools.chain(base_questions, contextual_questions)
+                               if q not in asked_questions]
         
         # If we've asked everything, use general questions
         if not available_questions:
-            general_questions = [
-                "How are you feeling about the resources I've shared?",
-                "What kind of support do you think would be most helpful right now?",
-                "Is there anything else you'd like to talk about?"
-            ]
-            available_questions = [q for q in general_questions if q not in asked_questions]
+            available_questions = [q for q in _WRAP_UP_FOLLOW_UPS if q not in asked_questions]
         
         # Track the question we're about to ask
         if available_questions:
             selected_question = available_questions[0]  # Will be randomly selected later
-            if 'asked_questions' not in session.user_profile:
-                session.user_profile['asked_questions'] = set()
-            session.user_profile['asked_questions'].add(selected_question)
+            asked_questions.add(selected_question)
         
         return available_questions[:3]  # Return up to 3 options
     
@@ -347,13 +519,11 @@ class ConversationManager:
         # If this is the first message, establish primary concern based on priority
         if len(session.messages) <= 1:
             # Use our priority system to determine the main concern
-            category_priority = ['social_isolation', 'cultural_adjustment', 'self_esteem', 'academic_stress']
-            primary_concern = None
-            
-            for priority_cat in category_priority:
-                if priority_cat in current_analysis['categories']:
-                    primary_concern = priority_cat
-                    break
+            primary_concern = min(
+                (c for c in current_analysis['categories'] if c in _CATEGORY_RANK),
+                key=_CATEGORY_RANK.__getitem__,
+                default=None
+            )
             
             if primary_concern:
                 session.user_profile['primary_concerns'] = [primary_concern]
@@ -371,8 +541,8 @@ class ConversationManager:
         # 3. User explicitly mentions a completely different major concern
         should_switch_context = (
             not established_concerns or
-            current_analysis['severity'] in [SeverityLevel.HIGH, SeverityLevel.CRISIS] or
-            self._is_major_context_shift(established_concerns, current_analysis['categories'])
+            current_analysis['severity'] in _HIGH_RISK_LEVELS or
+            self._is_major_context_shift(established_concerns, current_analysis['categories_set'])
         )
         
         if should_switch_context:
@@ -382,63 +552,54 @@ class ConversationManager:
             # Maintain established conversation context
             return established_concerns
     
-    def _is_major_context_shift(self, established: List[str], current: List[str]) -> bool:
+    def _is_major_context_shift(self, established: Iterable[str], current: Iterable[str]) -> bool:
         """Determine if current analysis represents a major shift in conversation context."""
-        # Define major concern categories that warrant context switching
-        major_concerns = ['crisis', 'self_harm', 'suicidal_ideation']
-        
-        # Check if current analysis contains major concerns not in established
-        for concern in current:
-            if concern in major_concerns and concern not in established:
-                return True
-        
-        # Otherwise, maintain established context
-        return False
+        # Switch only when current analysis raises a major concern not already established
+        return bool(_MAJOR_CONCERNS.intersection(current).difference(established))
     
-    def _handle_provider_search_flow(self, session_id: str, user_input: str, session: ConversationSession) -> str:
+    def _handle_provider_search_flow(self, session_id: str, user_input: str, session: ConversationSession,
+                                     user_input_lower: Optional[str] = None) -> str:
         """Handle the provider search conversation flow."""
         current_step = session.user_profile.get('provider_search_step', 'location_collection')
         
-        if current_step == 'location_collection':
-            response = provider_flow.process_location_response(session_id, user_input)
-            session.user_profile['provider_search_step'] = 'insurance_collection'
-        elif current_step == 'insurance_collection':
-            response = provider_flow.process_insurance_response(session_id, user_input)
-            session.user_profile['provider_search_step'] = 'care_type_collection'
-        elif current_step == 'care_type_collection':
-            response = provider_flow.process_care_type_response(session_id, user_input)
-            session.user_profile['provider_search_step'] = 'specialties_collection'
-        elif current_step == 'specialties_collection':
-            response = provider_flow.process_specialties_response(session_id, user_input)
-            session.user_profile['provider_search_step'] = 'final_preferences'
-        elif current_step == 'final_preferences':
-            response = provider_flow.process_final_preferences(session_id, user_input)
+        step = self._provider_steps.get(current_step)
+        if step is None:
+            # Fallback - restart the flow
+            response = provider_flow.start_provider_search(session_id)
+            session.user_profile['provider_search_step'] = 'location_collection'
+            return response
+        
+        handler, next_step = step
+        response = handler(session_id, user_input, user_input_lower)
+        
+        if next_step is None:
             # Provider search is complete
             session.user_profile['provider_search_active'] = False
             session.user_profile['provider_search_completed'] = True
         else:
-            # Fallback - restart the flow
-            response = provider_flow.start_provider_search(session_id)
-            session.user_profile['provider_search_step'] = 'location_collection'
+            session.user_profile['provider_search_step'] = next_step
         
         return response
     
-    def _update_session_metadata(self, session: ConversationSession, analysis: Dict):
+    def _update_session_metadata(self, session: ConversationSession, analysis: Dict,
+                                 now: Optional[datetime] = None):
         """Update session metadata based on analysis."""
         # Update user profile
-        if 'cultural_adjustment' in analysis['categories']:
+        if 'cultural_adjustment' in analysis['categories_set']:
             session.user_profile['is_international'] = True
         
-        if analysis['severity'] in [SeverityLevel.HIGH, SeverityLevel.CRISIS]:
+        if analysis['severity'] in _HIGH_RISK_LEVELS:
             session.user_profile['high_risk'] = True
         
         # Track conversation themes
-        session.user_profile['primary_concerns'] = list(set(
-            session.user_profile.get('primary_concerns', []) + analysis['categories']
-        ))
-        
-        # Update session activity
-        session.user_profile['last_activity'] = datetime.now().isoformat()
+        # Only rebuild the list when this turn adds a new concern
+        primary_concerns = session.user_profile.get('primary_concerns', [])
+        new_concerns = [c for c in analysis['categories'] if c not in primary_concerns]
+        if new_concerns:
+            session.user_profile['primary_concerns'] = primary_concerns + new_concerns
+        
+        # Update session activity (kept as an epoch; formatted only in summaries)
+        session.user_profile['last_activity_epoch'] = now.timestamp() if now else time.time()
         session.user_profile['message_count'] = len(session.messages)
     
     def get_session_summary(self, session_id: str) -> Optional[Dict]:
@@ -452,25 +613,19 @@ class ConversationManager:
                           if msg.severity_assessment]
         
         # Find highest severity using enum ordering
-        severity_order = {
-            SeverityLevel.LOW: 0,
-            SeverityLevel.MODERATE: 1,
-            SeverityLevel.HIGH: 2,
-            SeverityLevel.CRISIS: 3
-        }
+        highest_severity = max(severity_levels, default=SeverityLevel.LOW)
         
-        if severity_levels:
-            highest_severity = max(severity_levels, key=lambda s: severity_order[s])
-        else:
-            highest_severity = SeverityLevel.LOW
+        # Concerns and resources are deduplicated as they are recorded
+        unique_concerns = list(session.identified_concerns)
+        unique_resources = list(session.recommended_resources)
         
-        # Get unique concerns and resources
-        unique_concerns = list(set(session.identified_concerns))
-        unique_resources = list(set(session.recommended_resources))
+        last_activity_epoch = session.user_profile.get('last_activity_epoch')
         
         return {
             'session_id': session_id,
             'start_time': session.start_time.isoformat(),
+            'last_activity': (datetime.fromtimestamp(last_activity_epoch).isoformat()
+                              if last_activity_epoch is not None else None),
             'duration_minutes': (datetime.now() - session.start_time).total_seconds() / 60,
             'message_count': len(session.messages),
             'response_count': len(session.responses),
@@ -484,16 +639,24 @@ class ConversationManager:
     def cleanup_old_sessions(self, hours: int = 24):
         """Clean up sessions older than specified hours."""
         cutoff_time = datetime.now() - timedelta(hours=hours)
-        expired_sessions = [
-            session_id for session_id, session in self.active_sessions.items()
-            if session.start_time < cutoff_time
-        ]
         
-        for session_id in expired_sessions:
-            del self.active_sessions[session_id]
-            logger.info(f"Cleaned up expired session: {session_id[:8]}...")
+        # start_time can be changed after a session is created, so check
+        # every session rather than trusting creation order
+        with self._sessions_lock:
+            expired_sessions = [
+                session_id for session_id, session in self.active_sessions.items()
+                if session.start_time < cutoff_time
+            ]
+            
+            for session_id in expired_sessions:
+                if self.active_sessions.pop(session_id).is_active:
+                    self._active_count -= 1
         
-        return len(expired_sessions)
+        expired_count = len(expired_sessions)
+        if expired_count:
+            logger.info(f"Cleaned up {expired_count} expired sessions")
+        
+        return expired_count
     
     def get_conversation_history(self, session_id: str, limit: int = 10) -> List[Dict]:
         """Get conversation history for display."""
@@ -503,42 +666,56 @@ class ConversationManager:
         
         history = []
         
-        # Interleave messages and responses
-        for i in range(min(len(session.messages), len(session.responses), limit)):
-            history.append({
-                'type': 'user',
-                'content': session.messages[i].content,
-                'timestamp': session.messages[i].timestamp.isoformat(),
-                'severity': session.messages[i].severity_assessment.value if session.messages[i].severity_assessment else None
-            })
+        # Only interleave the most recent pairs needed to fill `limit` entries
+        pair_count = min(len(session.messages), len(session.responses))
+        start = max(0, pair_count - (limit + 1) // 2)
+        
+        # With an odd limit the oldest pair only contributes its bot response
+        skip_user = 2 * (pair_count - start) > limit
+        
+        for message, response in zip(session.messages[start:pair_count],
+                                     session.responses[start:pair_count]):
+            if skip_user:
+                skip_user = False
+            else:
+                severity = message.severity_assessment
+                history.append({
+                    'type': 'user',
+                    'content': message.content,
+                    'timestamp': message.timestamp.isoformat(),
+                    'severity': severity.value if severity else None
+                })
             
             history.append({
                 'type': 'bot',
-                'content': session.responses[i].content,
-                'timestamp': session.responses[i].timestamp.isoformat(),
-                'response_type': session.responses[i].response_type
+                'content': response.content,
+                'timestamp': response.timestamp.isoformat(),
+                'response_type': response.response_type
             })
         
-        return history[-limit:]  # Return most recent entries
+        return history  # Most recent entries, at most `limit`
     
     def end_session(self, session_id: str) -> bool:
         """End a conversation session."""
-        if session_id in self.active_sessions:
-            session = self.active_sessions[session_id]
-            session.is_active = False
-            
-            # Log session end
-            logger.log_user_interaction(session_id, "session_ended")
-            
-            # Keep session for a while for potential reference
-            # In production, you might want to save to database
-            return True
+        session = self.active_sessions.get(session_id)
+        if session is None:
+            return False
+        
+        with self._sessions_lock:
+            if session.is_active:
+                session.is_active = False
+                self._active_count -= 1
+        
+        # Log session end
+        self._log_interaction(session_id, "session_ended")
         
-        return False
+        # Keep session for a while for potential reference
+        # In production, you might want to save to database
+        return True
     
     def get_active_session_count(self) -> int:
         """Get count of active sessions."""
-        return len([s for s in self.active_sessions.values() if s.is_active])
+        return self._active_count
 
 # Global conversation manager instance
 conversation_manager = ConversationManager()
\ No newline at end of file
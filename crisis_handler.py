@@ -1,11 +1,81 @@
 """Crisis detection and intervention handling for mental health emergencies."""
 
-from typing import List, Tuple, Dict
+import re
+from functools import lru_cache
+from itertools import islice
+from typing import List, Tuple, Dict, Optional, Sequence
 from data_models import CrisisAssessment, SeverityLevel, Resource
 from resource_database import resource_db
-from utils.text_processing import text_processor
+from utils.text_processing import text_processor, trie_regex
 from utils.logger import logger
 
+# Risk level implied by a keyword from each crisis category
+_CATEGORY_SEVERITY: Dict[str, SeverityLevel] = {
+    'immediate_danger': SeverityLevel.CRISIS,
+    'self_harm': SeverityLevel.HIGH,
+    'hopelessness': SeverityLevel.MODERATE,
+    'emergency_requests': SeverityLevel.MODERATE
+}
+
+# Immediate actions per risk level; LOW uses the default
+_IMMEDIATE_ACTIONS: Dict[SeverityLevel, Tuple[str, ...]] = {
+    SeverityLevel.CRISIS: (
+        "Contact crisis hotline immediately (988)",
+        "If in immediate danger, call 911",
+        "Reach out to Northeastern emergency services: (617) 373-3333",
+        "Contact MindBridge Care crisis support: 1-800-CRISIS-MB",
+        "Stay with someone you trust or go to emergency room"
+    ),
+    SeverityLevel.HIGH: (
+        "Contact Northeastern CAPS: (617) 373-2772",
+        "Call 988 if thoughts become more intense",
+        "Reach out to MindBridge Care counseling",
+        "Talk to a trusted friend, family member, or advisor",
+        "Consider visiting CAPS for same-day consultation"
+    ),
+    SeverityLevel.MODERATE: (
+        "Schedule appointment with Northeastern CAPS",
+        "Contact MindBridge Care for counseling support",
+        "Reach out to peer support resources",
+        "Practice self-care and stress management techniques"
+    )
+}
+_DEFAULT_IMMEDIATE_ACTIONS: Tuple[str, ...] = (
+    "Consider talking to a counselor about your concerns",
+    "Contact MindBridge Care wellness programs",
+    "Connect with peer support groups"
+)
+
+# Recommended contacts per risk level; MODERATE and LOW use the default
+_RECOMMENDED_CONTACTS: Dict[SeverityLevel, Tuple[str, ...]] = {
+    SeverityLevel.CRISIS: (
+        "988 - Suicide & Crisis Lifeline (24/7)",
+        "911 - Emergency Services",
+        "(617) 373-3333 - Northeastern Emergency",
+        "1-800-CRISIS-MB - MindBridge Crisis Support"
+    ),
+    SeverityLevel.HIGH: (
+        "988 - Suicide & Crisis Lifeline (24/7)",
+        "(617) 373-2772 - Northeastern CAPS",
+        "1-800-MINDBRIDGE - MindBridge Care",
+        "(617) 373-3333 - Northeastern Emergency (if needed)"
+    )
+}
+_DEFAULT_RECOMMENDED_CONTACTS: Tuple[str, ...] = (
+    "(617) 373-2772 - Northeastern CAPS",
+    "1-800-MINDBRIDGE - MindBridge Care",
+    "988 - Crisis Lifeline (if needed)"
+)
+
+# (immediate actions, recommended contacts) bundle for every risk level
+_CRISIS_PAYLOADS: Dict[SeverityLevel, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    level: (
+        _IMMEDIATE_ACTIONS.get(level, _DEFAULT_IMMEDIATE_ACTIONS),
+        _RECOMMENDED_CONTACTS.get(level, _DEFAULT_RECOMMENDED_CONTACTS)
+    )
+    for level in SeverityLevel
+}
+
 class CrisisHandler:
     """Handles crisis detection and appropriate intervention responses."""
     
@@ -28,6 +98,20 @@ class CrisisHandler:
             ]
         }
         
+        # Flat (keyword, indicator, implied risk) entries in declaration order,
+        # immediate danger first, plus one pattern that finds every keyword
+        # occurrence in a single pass. The lookahead tries a match at each
+        # position, so overlapping keywords are all reported (no keyword is a
+        # prefix of another, so the trie's longest match loses nothing).
+        self._flat_keywords: Tuple[Tuple[str, str, SeverityLevel], ...] = tuple(
+            (keyword, f"{category}: {keyword}", _CATEGORY_SEVERITY[category])
+            for category, keywords in self.crisis_keywords.items()
+            for keyword in keywords
+        )
+        self._keyword_pattern = re.compile(
+            '(?=(' + trie_regex(entry[0] for entry in self._flat_keywords) + '))'
+        )
+        
         self.crisis_responses = {
             'immediate_safety': [
                 "I'm very concerned about what you're sharing with me. Your safety is the most important thing right now.",
@@ -45,46 +129,37 @@ class CrisisHandler:
                 "Your life has value, and there are people who want to help you."
             ]
         }
+        
+        # Replies depend only on the risk level, so each is built once here
+        self._responses_by_level = {
+            SeverityLevel.CRISIS: self._build_crisis_response(),
+            SeverityLevel.HIGH: self._build_high_risk_response()
+        }
+        self._default_response = self._build_moderate_risk_response()
+        
+        # Scoring is a pure function of (lowercased input, recent history), so
+        # repeated checks (retries, re-sent messages) are answered from cache
+        self._cached_score_risk = lru_cache(maxsize=256)(self._score_risk)
     
-    def assess_crisis_risk(self, user_input: str, conversation_history: List[str] = None) -> CrisisAssessment:
+    def assess_crisis_risk(self, user_input: str, conversation_history: Sequence[str] = None,
+                           user_input_lower: Optional[str] = None) -> CrisisAssessment:
         """Assess the crisis risk level based on user input and conversation history."""
-        user_input_lower = user_input.lower()
-        detected_indicators = []
-        risk_level = SeverityLevel.LOW
+        if user_input_lower is None:
+            user_input_lower = user_input.lower()
         
-        # Check for immediate danger indicators
-        for category, keywords in self.crisis_keywords.items():
-            for keyword in keywords:
-                if keyword in user_input_lower:
-                    detected_indicators.append(f"{category}: {keyword}")
-                    if category == 'immediate_danger':
-                        risk_level = SeverityLevel.CRISIS
-                    elif category == 'self_harm' and risk_level != SeverityLevel.CRISIS:
-                        risk_level = SeverityLevel.HIGH
-                    elif risk_level == SeverityLevel.LOW:
-                        risk_level = SeverityLevel.MODERATE
-        
-        # Use text processor for additional analysis
-        is_crisis, crisis_indicators = text_processor.detect_crisis_indicators(user_input)
-        if is_crisis:
-            detected_indicators.extend(crisis_indicators)
-            if risk_level == SeverityLevel.LOW:
-                risk_level = SeverityLevel.HIGH
+        # Last 3 messages; islice also accepts the session's rolling deque
+        recent_history = tuple(islice(
+            conversation_history, max(len(conversation_history) - 3, 0), None
+        )) if conversation_history else ()
         
-        # Check conversation history for escalating patterns
-        if conversation_history:
-            history_text = ' '.join(conversation_history[-3:])  # Last 3 messages
-            history_severity = text_processor.assess_severity(history_text)
-            if history_severity == SeverityLevel.CRISIS:
-                risk_level = SeverityLevel.CRISIS
+        risk_level, detected_indicators = self._cached_score_risk(user_input_lower, recent_history)
         
         # Determine immediate actions needed
-        immediate_actions = self._get_immediate_actions(risk_level, detected_indicators)
-        recommended_contacts = self._get_recommended_contacts(risk_level)
+        immediate_actions, recommended_contacts = self._get_crisis_payload(risk_level)
         
         assessment = CrisisAssessment(
             risk_level=risk_level,
-            detected_indicators=detected_indicators,
+            detected_indicators=list(detected_indicators),
             immediate_actions=immediate_actions,
             recommended_contacts=recommended_contacts,
             requires_immediate_intervention=(risk_level == SeverityLevel.CRISIS)
@@ -96,73 +171,47 @@ class CrisisHandler:
         
         return assessment
     
-    def _get_immediate_actions(self, risk_level: SeverityLevel, indicators: List[str]) -> List[str]:
-        """Get immediate actions based on risk level."""
-        if risk_level == SeverityLevel.CRISIS:
-            return [
-                "Contact crisis hotline immediately (988)",
-                "If in immediate danger, call 911",
-                "Reach out to Northeastern emergency services: (617) 373-3333",
-                "Contact MindBridge Care crisis support: 1-800-CRISIS-MB",
-                "Stay with someone you trust or go to emergency room"
-            ]
-        elif risk_level == SeverityLevel.HIGH:
-            return [
-                "Contact Northeastern CAPS: (617) 373-2772",
-                "Call 988 if thoughts become more intense",
-                "Reach out to MindBridge Care counseling",
-                "Talk to a trusted friend, family member, or advisor",
-                "Consider visiting CAPS for same-day consultation"
-            ]
-        elif risk_level == SeverityLevel.MODERATE:
-            return [
-                "Schedule appointment with Northeastern CAPS",
-                "Contact MindBridge Care for counseling support",
-                "Reach out to peer support resources",
-                "Practice self-care and stress management techniques"
-            ]
-        else:
-            return [
-                "Consider talking to a counselor about your concerns",
-                "Contact MindBridge Care wellness programs",
-                "Connect with peer support groups"
-            ]
+    def _score_risk(self, user_input_lower: str,
+                    recent_history: Tuple[str, ...]) -> Tuple[SeverityLevel, Tuple[str, ...]]:
+        """Score the risk level and collect indicators for lowercased input and recent history."""
+        detected_indicators = []
+        risk_level = SeverityLevel.LOW
+        
+        # Check for immediate danger indicators
+        found_keywords = {match.group(1) for match in self._keyword_pattern.finditer(user_input_lower)}
+        if found_keywords:
+            # Report in declaration order, as the per-keyword scan did
+            for keyword, indicator, severity in self._flat_keywords:
+                if keyword in found_keywords:
+                    detected_indicators.append(indicator)
+                    risk_level = max(risk_level, severity)
+        
+        # Use text processor for additional analysis
+        is_crisis, crisis_indicators = text_processor.detect_crisis_indicators(user_input_lower, user_input_lower)
+        if is_crisis:
+            detected_indicators.extend(crisis_indicators)
+            if risk_level == SeverityLevel.LOW:
+                risk_level = SeverityLevel.HIGH
+        
+        # Check conversation history for escalating patterns (it can only
+        # raise the level to CRISIS, so skip it once we are already there)
+        if recent_history and risk_level != SeverityLevel.CRISIS:
+            # _score_risk is cached on the history tuple, so scanning the
+            # joined messages also catches keywords split across them
+            if text_processor.contains_crisis_keyword(' '.join(recent_history).lower()):
+                risk_level = SeverityLevel.CRISIS
+        
+        return risk_level, tuple(detected_indicators)
     
-    def _get_recommended_contacts(self, risk_level: SeverityLevel) -> List[str]:
-        """Get recommended contacts based on risk level."""
-        if risk_level == SeverityLevel.CRISIS:
-            return [
-                "988 - Suicide & Crisis Lifeline (24/7)",
-                "911 - Emergency Services",
-                "(617) 373-3333 - Northeastern Emergency",
-                "1-800-CRISIS-MB - MindBridge Crisis Support"
-            ]
-        elif risk_level == SeverityLevel.HIGH:
-            return [
-                "988 - Suicide & Crisis Lifeline (24/7)",
-                "(617) 373-2772 - Northeastern CAPS",
-                "1-800-MINDBRIDGE - MindBridge Care",
-                "(617) 373-3333 - Northeastern Emergency (if needed)"
-            ]
-        else:
-            return [
-                "(617) 373-2772 - Northeastern CAPS",
-                "1-800-MINDBRIDGE - MindBridge Care",
-                "988 - Crisis Lifeline (if needed)"
-            ]
+    def _get_crisis_payload(self, risk_level: SeverityLevel) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Get the shared (immediate actions, recommended contacts) for a risk level."""
+        return _CRISIS_PAYLOADS[risk_level]
     
     def generate_crisis_response(self, assessment: CrisisAssessment) -> str:
         """Generate appropriate crisis response based on assessment."""
-        if assessment.risk_level == SeverityLevel.CRISIS:
-            response = self._build_crisis_response(assessment)
-        elif assessment.risk_level == SeverityLevel.HIGH:
-            response = self._build_high_risk_response(assessment)
-        else:
-            response = self._build_moderate_risk_response(assessment)
-        
-        return response
+        return self._responses_by_level.get(assessment.risk_level, self._default_response)
     
-    def _build_crisis_response(self, assessment: CrisisAssessment) -> str:
+    def _build_crisis_response(self) -> str:
         """Build response for crisis-level situations."""
         response_parts = [
             "🚨 **CRISIS SUPPORT NEEDED** 🚨",
@@ -182,7 +231,7 @@ class CrisisHandler:
         
         return "\n".join(response_parts)
     
-    def _build_high_risk_response(self, assessment: CrisisAssessment) -> str:
+    def _build_high_risk_response(self) -> str:
         """Build response for high-risk situations."""
         response_parts = [
             "⚠️ **URGENT SUPPORT RECOMMENDED** ⚠️",
@@ -201,7 +250,7 @@ class CrisisHandler:
         
         return "\n".join(response_parts)
     
-    def _build_moderate_risk_response(self, assessment: CrisisAssessment) -> str:
+    def _build_moderate_risk_response(self) -> str:
         """Build response for moderate-risk situations."""
         response_parts = [
             "I hear that you're going through a difficult time. It's important to get support.",
@@ -216,7 +265,7 @@ class CrisisHandler:
         
         return "\n".join(response_parts)
     
-    def get_crisis_resources(self) -> List[Resource]:
+    def get_crisis_resources(self) -> Sequence[Resource]:
         """Get all available crisis resources."""
         return resource_db.get_crisis_resources()
     
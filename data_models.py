@@ -1,17 +1,38 @@
 """Data models for the XN Mental Health Chatbot."""
 
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Deque, Sequence
 from enum import Enum
+from functools import total_ordering
 from datetime import datetime
 
+@total_ordering
 class SeverityLevel(Enum):
-    """Severity levels for mental health concerns."""
+    """Severity levels for mental health concerns.
+
+    Members compare in declaration order (LOW < CRISIS) while keeping
+    their string values for logging and JSON output.
+    """
     LOW = "low"
     MODERATE = "moderate"
     HIGH = "high"
     CRISIS = "crisis"
 
+    def __lt__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return _SEVERITY_RANK[self] < _SEVERITY_RANK[other]
+
+# Declaration-order rank backing SeverityLevel comparisons
+_SEVERITY_RANK: Dict[SeverityLevel, int] = {
+    level: rank for rank, level in enumerate(SeverityLevel)
+}
+
+# Contact fields shown when a resource is listed with a single contact
+_PRIMARY_CONTACT_KEYS = ('phone', 'website', 'email')
+
 class ResourceType(Enum):
     """Types of mental health resources."""
     COUNSELING = "counseling"
@@ -21,7 +42,7 @@ class ResourceType(Enum):
     WELLNESS = "wellness"
     MINDBRIDGE_BENEFIT = "mindbridge_benefit"
 
-@dataclass
+@dataclass(slots=True)
 class MentalHealthScenario:
     """Represents a mental health scenario with associated metadata."""
     id: str
@@ -34,7 +55,7 @@ class MentalHealthScenario:
     recommended_resources: List[str] = field(default_factory=list)
     response_templates: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     """Represents a geographic location."""
     address: str = ""
@@ -44,7 +65,7 @@ class Location:
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     
-@dataclass
+@dataclass(slots=True)
 class Provider:
     """Represents a mental health provider."""
     id: str
@@ -59,7 +80,7 @@ class Provider:
     telehealth_available: bool = False
     accepting_new_patients: bool = True
     
-@dataclass
+@dataclass(slots=True)
 class Resource:
     """Represents a mental health resource or service."""
     id: str
@@ -78,8 +99,16 @@ class Resource:
     providers: List[Provider] = field(default_factory=list)
     service_area: List[str] = field(default_factory=list)  # Cities/regions served
     telehealth_available: bool = False
+    # First of phone/website/email, resolved once from contact_info
+    primary_contact: str = field(init=False, repr=False, compare=False)
 
-@dataclass
+    def __post_init__(self):
+        self.primary_contact = next(
+            (self.contact_info[key] for key in _PRIMARY_CONTACT_KEYS if key in self.contact_info),
+            'Contact available'
+        )
+
+@dataclass(slots=True)
 class UserPreferences:
     """User preferences for provider matching."""
     location: Optional[Location] = None
@@ -92,7 +121,7 @@ class UserPreferences:
     budget_range: Optional[str] = None
     availability_preference: List[str] = field(default_factory=list)  # "weekdays", "evenings", "weekends"
 
-@dataclass
+@dataclass(slots=True)
 class ProviderMatch:
     """Represents a matched provider with relevance score."""
     provider: Provider
@@ -101,7 +130,7 @@ class ProviderMatch:
     match_reasons: List[str] = field(default_factory=list)
     distance_miles: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class UserMessage:
     """Represents a user message in the conversation."""
     content: str
@@ -110,7 +139,7 @@ class UserMessage:
     severity_assessment: Optional[SeverityLevel] = None
     matched_scenarios: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class BotResponse:
     """Represents a bot response with associated metadata."""
     content: str
@@ -120,7 +149,7 @@ class BotResponse:
     follow_up_questions: List[str] = field(default_factory=list)
     requires_human_intervention: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class ConversationSession:
     """Represents a complete conversation session."""
     session_id: str
@@ -128,12 +157,13 @@ class ConversationSession:
     messages: List[UserMessage] = field(default_factory=list)
     responses: List[BotResponse] = field(default_factory=list)
     user_profile: Dict[str, Any] = field(default_factory=dict)
-    identified_concerns: List[str] = field(default_factory=list)
-    recommended_resources: List[str] = field(default_factory=list)
+    identified_concerns: List[str] = field(default_factory=list)  # Unique, first-seen order
+    recommended_resources: List[str] = field(default_factory=list)  # Unique, first-seen order
     crisis_flags: List[str] = field(default_factory=list)
     is_active: bool = True
+    recent_contents: Deque[str] = field(default_factory=lambda: deque(maxlen=5))  # Last 5 user messages
 
-@dataclass
+@dataclass(slots=True)
 class Recommendation:
     """Represents a personalized recommendation for a user."""
     resource_id: str
@@ -144,12 +174,18 @@ class Recommendation:
     is_immediate: bool = False
     follow_up_actions: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class CrisisAssessment:
     """Represents a crisis risk assessment."""
     risk_level: SeverityLevel
     detected_indicators: List[str]
-    immediate_actions: List[str]
-    recommended_contacts: List[str]
+    immediate_actions: Sequence[str]  # Shared per-level tuples; read-only
+    recommended_contacts: Sequence[str]
     requires_immediate_intervention: bool
-    assessment_timestamp: datetime = field(default_factory=datetime.now)
\ No newline at end of file
+    # Raw clock reading; converted to a datetime only when someone asks for it
+    assessment_time_ns: int = field(default_factory=time.time_ns)
+    
+    @property
+    def assessment_timestamp(self) -> datetime:
+        """When the assessment was made, as a local datetime."""
+        return datetime.fromtimestamp(self.assessment_time_ns / 1e9)
\ No newline at end of file
@@ -3,116 +3,144 @@
 Debug script to test Gemini API key functionality
 """
 
+import logging
 import os
 import sys
+from functools import lru_cache
+from logging.handlers import MemoryHandler
 sys.path.insert(0, '.')
 
+from config import config
+from llm_client import llm_client
+
+# Report through a buffered logger so status lines go out in batches;
+# the buffer is flushed before each network call and at exit
+log = logging.getLogger('debug_api_key')
+log.setLevel(logging.INFO)
+log.propagate = False
+_console = logging.StreamHandler(sys.stdout)
+_console.setFormatter(logging.Formatter('%(message)s'))
+_buffer = MemoryHandler(64, flushLevel=logging.ERROR, target=_console)
+log.addHandler(_buffer)
+
+try:
+    import google.generativeai as genai
+except ImportError:
+    genai = None
+
+@lru_cache(maxsize=1)
+def _get_model(api_key):
+    """Configure Gemini for this key and return a model, reused while the key is unchanged.
+
+    ``genai.configure`` is process-global, so only the most recent key is kept.
+    """
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel('gemini-pro')
+
 def test_api_key_direct(api_key):
     """Test API key directly with Gemini."""
-    print(f"🔍 Testing API key: {api_key[:10]}...{api_key[-4:]}")
-    print(f"📏 Key length: {len(api_key)} characters")
+    log.info(f"🔍 Testing API key: {api_key[:10]}...{api_key[-4:]}")
+    log.info(f"📏 Key length: {len(api_key)} characters")
     
     try:
-        import google.generativeai as genai
-        print("✅ Google Generative AI library available")
-        
-        # Configure API
-        genai.configure(api_key=api_key)
-        print("✅ API key configured")
+        if genai is None:
+            raise ImportError("No module named 'google.generativeai'")
+        log.info("✅ Google Generative AI library available")
         
-        # Create model
-        model = genai.GenerativeModel('gemini-pro')
-        print("✅ Model created")
+        # Configure API and create model
+        model = _get_model(api_key)
+        log.info("✅ API key configured")
+        log.info("✅ Model created")
         
         # Test generation
-        print("🧪 Testing content generation...")
+        log.info("🧪 Testing content generation...")
+        _buffer.flush()
         response = model.generate_content(
             "Say hello in exactly 2 words",
             generation_config={'max_output_tokens': 10}
         )
         
         if response and response.text:
-            print(f"✅ API test successful!")
-            print(f"📝 Response: '{response.text.strip()}'")
+            log.info(f"✅ API test successful!")
+            log.info(f"📝 Response: '{response.text.strip()}'")
             return True
         else:
-            print("❌ No response from API")
-            print(f"Response object: {response}")
+            log.info("❌ No response from API")
+            log.info(f"Response object: {response}")
             return False
             
     except Exception as e:
-        print(f"❌ API test failed: {e}")
-        print(f"Error type: {type(e).__name__}")
+        log.info(f"❌ API test failed: {e}")
+        log.info(f"Error type: {type(e).__name__}")
         return False
 
 def test_with_chatbot_system(api_key):
     """Test with the actual chatbot system."""
-    print("\n🤖 TESTING WITH CHATBOT SYSTEM")
-    print("=" * 50)
+    log.info("\n🤖 TESTING WITH CHATBOT SYSTEM")
+    log.info("=" * 50)
     
     # Set environment
     os.environ["GEMINI_API_KEY"] = api_key
     
-    # Import and configure
-    from config import config
-    from llm_client import llm_client
-    
+    # Configure
     config.GEMINI_API_KEY = api_key
     config.ENABLE_LLM = True
     
-    print("🔄 Initializing LLM client...")
+    log.info("🔄 Initializing LLM client...")
+    _buffer.flush()
     llm_client._initialize_client()
     
-    print(f"🔍 Client available: {llm_client.is_available()}")
-    print(f"🔍 Client object: {llm_client.client}")
+    log.info(f"🔍 Client available: {llm_client.is_available()}")
+    log.info(f"🔍 Client object: {llm_client.client}")
     
     if llm_client.is_available():
-        print("✅ LLM client working!")
+        log.info("✅ LLM client working!")
         
         # Test generation
+        _buffer.flush()
         test_response = llm_client.generate_response("Hello, how are you?")
-        print(f"📝 Test response: {test_response[:100]}...")
+        log.info(f"📝 Test response: {test_response[:100]}...")
         return True
     else:
-        print("❌ LLM client not available")
+        log.info("❌ LLM client not available")
         return False
 
 def main():
     """Main debug function."""
-    print("🔑 GEMINI API KEY DEBUGGER")
-    print("=" * 40)
+    log.info("🔑 GEMINI API KEY DEBUGGER")
+    log.info("=" * 40)
     
     # Check environment variable
     api_key = os.environ.get("GEMINI_API_KEY")
     if api_key:
-        print(f"✅ Found API key in environment: {api_key[:10]}...{api_key[-4:]}")
+        log.info(f"✅ Found API key in environment: {api_key[:10]}...{api_key[-4:]}")
     else:
-        print("❌ No API key found in environment")
-        print("Please set GEMINI_API_KEY environment variable")
+        log.info("❌ No API key found in environment")
+        log.info("Please set GEMINI_API_KEY environment variable")
         return
     
     # Test direct API
-    print("\n1️⃣ DIRECT API TEST")
-    print("=" * 30)
+    log.info("\n1️⃣ DIRECT API TEST")
+    log.info("=" * 30)
     direct_success = test_api_key_direct(api_key)
     
     # Test with chatbot
-    print("\n2️⃣ CHATBOT INTEGRATION TEST")
-    print("=" * 30)
+    log.info("\n2️⃣ CHATBOT INTEGRATION TEST")
+    log.info("=" * 30)
     chatbot_success = test_with_chatbot_system(api_key)
     
     # Summary
-    print("\n📊 SUMMARY")
-    print("=" * 20)
-    print(f"Direct API Test: {'✅ PASS' if direct_success else '❌ FAIL'}")
-    print(f"Chatbot Integration: {'✅ PASS' if chatbot_success else '❌ FAIL'}")
+    log.info("\n📊 SUMMARY")
+    log.info("=" * 20)
+    log.info(f"Direct API Test: {'✅ PASS' if direct_success else '❌ FAIL'}")
+    log.info(f"Chatbot Integration: {'✅ PASS' if chatbot_success else '❌ FAIL'}")
     
     if direct_success and chatbot_success:
-        print("\n🎉 Your API key should work perfectly!")
+        log.info("\n🎉 Your API key should work perfectly!")
     elif direct_success and not chatbot_success:
-        print("\n⚠️  API key works, but chatbot integration has issues")
+        log.info("\n⚠️  API key works, but chatbot integration has issues")
     else:
-        print("\n❌ API key validation failed")
+        log.info("\n❌ API key validation failed")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -12,8 +12,26 @@ This script demonstrates how the system:
 from conversation_flow import conversation_manager
 from resource_database import resource_db
 from data_models import SeverityLevel
+import os
+import sys
 import time
 
+# Pace the scenarios for a human reader only when asked to
+INTERACTIVE = os.environ.get("XN_DEMO_INTERACTIVE") == "1"
+
+# Contact fields to show for a resource, in order of preference
+CONTACT_KEYS = ('phone', 'website')
+
+def _pick_contact(contact_info):
+    """Return the first available contact field for a resource."""
+    return next((contact_info[key] for key in CONTACT_KEYS if key in contact_info),
+                'Contact info available')
+
+def pause():
+    """Pause between scenarios in interactive runs."""
+    if INTERACTIVE:
+        time.sleep(1)
+
 def print_separator(title):
     """Print a formatted separator for demo sections."""
     print("\n" + "="*80)
@@ -25,23 +43,29 @@ def print_analysis(session_id, user_input, response, is_crisis):
     session = conversation_manager.active_sessions[session_id]
     latest_message = session.messages[-1]
     
-    print(f"\n🧠 SYSTEM ANALYSIS:")
-    print(f"   Detected Keywords: {latest_message.detected_keywords}")
-    print(f"   Severity Level: {latest_message.severity_assessment.value}")
-    print(f"   Identified Concerns: {session.identified_concerns}")
-    print(f"   Crisis Mode: {'YES' if is_crisis else 'NO'}")
-    print(f"   Recommended Resources: {len(session.recommended_resources)} resources")
-    
-    # Show specific resources
-    print(f"\n📋 RECOMMENDED RESOURCES:")
+    # Collect the whole block and write it in one go
+    lines = [
+        "\n🧠 SYSTEM ANALYSIS:",
+        f"   Detected Keywords: {latest_message.detected_keywords}",
+        f"   Severity Level: {latest_message.severity_assessment.value}",
+        f"   Identified Concerns: {session.identified_concerns}",
+        f"   Crisis Mode: {'YES' if is_crisis else 'NO'}",
+        f"   Recommended Resources: {len(session.recommended_resources)} resources",
+        # Show specific resources
+        "\n📋 RECOMMENDED RESOURCES:"
+    ]
     for i, resource_id in enumerate(session.recommended_resources[:5], 1):
         resource = resource_db.get_resource(resource_id)
         if resource:
-            contact = resource.contact_info.get('phone', resource.contact_info.get('website', 'Contact info available'))
-            print(f"   {i}. {resource.name}")
-            print(f"      Contact: {contact}")
-            print(f"      Type: {resource.resource_type.value}")
-            print(f"      Cost: {resource.cost}")
+            contact = _pick_contact(resource.contact_info)
+            lines.append(
+                f"   {i}. {resource.name}\n"
+                f"      Contact: {contact}\n"
+                f"      Type: {resource.resource_type.value}\n"
+                f"      Cost: {resource.cost}"
+            )
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def demo_academic_stress_scenario():
     """Demonstrate academic stress detection and resource recommendation."""
@@ -49,9 +73,8 @@ def demo_academic_stress_scenario():
     
     session_id = conversation_manager.start_new_session()
     
-    print("👤 STUDENT: I'm really overwhelmed with my upcoming final exams. I'm worried I'm going to fail and disappoint my parents. I can't sleep and I'm constantly anxious about studying.")
-    
     user_input = "I'm really overwhelmed with my upcoming final exams. I'm worried I'm going to fail and disappoint my parents. I can't sleep and I'm constantly anxious about studying."
+    print(f"👤 STUDENT: {user_input}")
     response, is_crisis = conversation_manager.process_user_message(session_id, user_input)
     
     print(f"\n🤖 SYSTEM RESPONSE:\n{response}")
@@ -59,9 +82,8 @@ def demo_academic_stress_scenario():
     print_analysis(session_id, user_input, response, is_crisis)
     
     # Follow-up conversation
-    print(f"\n👤 STUDENT: That's helpful. I'm particularly struggling with time management and study techniques.")
-    
     follow_up = "That's helpful. I'm particularly struggling with time management and study techniques."
+    print(f"\n👤 STUDENT: {follow_up}")
     follow_up_response, _ = conversation_manager.process_user_message(session_id, follow_up)
     
     print(f"\n🤖 SYSTEM FOLLOW-UP:\n{follow_up_response}")
@@ -75,9 +97,8 @@ def demo_crisis_intervention_scenario():
     
     session_id = conversation_manager.start_new_session()
     
-    print("👤 STUDENT: I can't take this anymore. I've been thinking about killing myself. Everything feels hopeless and I don't see a way out.")
-    
     user_input = "I can't take this anymore. I've been thinking about killing myself. Everything feels hopeless and I don't see a way out."
+    print(f"👤 STUDENT: {user_input}")
     response, is_crisis = conversation_manager.process_user_message(session_id, user_input)
     
     print(f"\n🚨 CRISIS RESPONSE:\n{response}")
@@ -93,9 +114,8 @@ def demo_social_isolation_scenario():
     
     session_id = conversation_manager.start_new_session()
     
-    print("👤 STUDENT: I feel so lonely at college. I don't have any real friends and I spend most of my time alone in my dorm. I see other students having fun together and I feel left out.")
-    
     user_input = "I feel so lonely at college. I don't have any real friends and I spend most of my time alone in my dorm. I see other students having fun together and I feel left out."
+    print(f"👤 STUDENT: {user_input}")
     response, is_crisis = conversation_manager.process_user_message(session_id, user_input)
     
     print(f"\n🤖 SYSTEM RESPONSE:\n{response}")
@@ -111,9 +131,8 @@ def demo_international_student_scenario():
     
     session_id = conversation_manager.start_new_session()
     
-    print("👤 STUDENT: I'm an international student from India and I'm really struggling with homesickness. The cultural differences are overwhelming and I miss my family so much. I feel like I don't fit in here.")
-    
     user_input = "I'm an international student from India and I'm really struggling with homesickness. The cultural differences are overwhelming and I miss my family so much. I feel like I don't fit in here."
+    print(f"👤 STUDENT: {user_input}")
     response, is_crisis = conversation_manager.process_user_message(session_id, user_input)
     
     print(f"\n🤖 SYSTEM RESPONSE:\n{response}")
@@ -130,9 +149,8 @@ def demo_multi_turn_conversation():
     session_id = conversation_manager.start_new_session()
     
     # Turn 1
-    print("👤 STUDENT: I'm having a really hard time this semester. I'm stressed about my grades and I feel isolated from other students.")
-    
     turn1 = "I'm having a really hard time this semester. I'm stressed about my grades and I feel isolated from other students."
+    print(f"👤 STUDENT: {turn1}")
     response1, _ = conversation_manager.process_user_message(session_id, turn1)
     
     print(f"\n🤖 SYSTEM: {response1[:200]}...")
@@ -143,9 +161,8 @@ def demo_multi_turn_conversation():
     print(f"   User Profile: {session.user_profile}")
     
     # Turn 2
-    print(f"\n👤 STUDENT: The academic stress is really the biggest issue. I'm a pre-med student and I'm worried about my GPA affecting my chances for medical school.")
-    
     turn2 = "The academic stress is really the biggest issue. I'm a pre-med student and I'm worried about my GPA affecting my chances for medical school."
+    print(f"\n👤 STUDENT: {turn2}")
     response2, _ = conversation_manager.process_user_message(session_id, turn2)
     
     print(f"\n🤖 SYSTEM: {response2[:200]}...")
@@ -156,9 +173,8 @@ def demo_multi_turn_conversation():
     print(f"   Context Retained: {'YES' if len(set(session.identified_concerns)) >= 2 else 'NO'}")
     
     # Turn 3
-    print(f"\n👤 STUDENT: What kind of academic support is available? I need help with study strategies and time management.")
-    
     turn3 = "What kind of academic support is available? I need help with study strategies and time management."
+    print(f"\n👤 STUDENT: {turn3}")
     response3, _ = conversation_manager.process_user_message(session_id, turn3)
     
     print(f"\n🤖 SYSTEM: {response3[:200]}...")
@@ -174,33 +190,48 @@ def demo_multi_turn_conversation():
     conversation_manager.end_session(session_id)
     return True
 
+# Formatted resource directory, built on first use; the database is static
+_resource_block = None
+
+def _build_resource_block():
+    """Format the MindBridge, Northeastern and crisis resource listings."""
+    lines = ["🏥 MINDBRIDGE CARE RESOURCES:"]
+    for resource in resource_db.get_mindbridge_resources():
+        lines.append(
+            f"\n   • {resource.name}\n"
+            f"     Description: {resource.description}\n"
+            f"     Availability: {resource.availability}\n"
+            f"     Contact: {resource.contact_info}\n"
+            f"     Cost: {resource.cost}"
+        )
+    
+    lines.append("\n🎓 NORTHEASTERN UNIVERSITY RESOURCES:")
+    for resource in resource_db.get_northeastern_resources():
+        lines.append(
+            f"\n   • {resource.name}\n"
+            f"     Description: {resource.description}\n"
+            f"     Contact: {resource.contact_info}\n"
+            f"     Availability: {resource.availability}"
+        )
+    
+    lines.append("\n🚨 CRISIS RESOURCES:")
+    for resource in resource_db.get_crisis_resources():
+        lines.append(
+            f"\n   • {resource.name}\n"
+            f"     Contact: {resource.contact_info}\n"
+            f"     Availability: {resource.availability}"
+        )
+    
+    return "\n".join(lines) + "\n"
+
 def demo_resource_specialist_information():
     """Demonstrate the comprehensive resource and specialist information available."""
+    global _resource_block
     print_separator("AVAILABLE MENTAL HEALTH RESOURCES & SPECIALISTS")
     
-    print("🏥 MINDBRIDGE CARE RESOURCES:")
-    mindbridge_resources = resource_db.get_mindbridge_resources()
-    for resource in mindbridge_resources:
-        print(f"\n   • {resource.name}")
-        print(f"     Description: {resource.description}")
-        print(f"     Availability: {resource.availability}")
-        print(f"     Contact: {resource.contact_info}")
-        print(f"     Cost: {resource.cost}")
-    
-    print(f"\n🎓 NORTHEASTERN UNIVERSITY RESOURCES:")
-    northeastern_resources = resource_db.get_northeastern_resources()
-    for resource in northeastern_resources:
-        print(f"\n   • {resource.name}")
-        print(f"     Description: {resource.description}")
-        print(f"     Contact: {resource.contact_info}")
-        print(f"     Availability: {resource.availability}")
-    
-    print(f"\n🚨 CRISIS RESOURCES:")
-    crisis_resources = resource_db.get_crisis_resources()
-    for resource in crisis_resources:
-        print(f"\n   • {resource.name}")
-        print(f"     Contact: {resource.contact_info}")
-        print(f"     Availability: {resource.availability}")
+    if _resource_block is None:
+        _resource_block = _build_resource_block()
+    sys.stdout.write(_resource_block)
     
     return True
 
@@ -212,19 +243,19 @@ def main():
     try:
         # Run all demonstration scenarios
         demo_academic_stress_scenario()
-        time.sleep(1)
+        pause()
         
         demo_crisis_intervention_scenario()
-        time.sleep(1)
+        pause()
         
         demo_social_isolation_scenario()
-        time.sleep(1)
+        pause()
         
         demo_international_student_scenario()
-        time.sleep(1)
+        pause()
         
         demo_multi_turn_conversation()
-        time.sleep(1)
+        pause()
         
         demo_resource_specialist_information()
         
@@ -13,13 +13,19 @@ from resource_database import resource_db
 from config import config
 import time
 
+# Wait for the reader between scenarios only when asked to
+INTERACTIVE = os.environ.get("XN_DEMO_INTERACTIVE") == "1"
+
 def demo_scenario(name, user_input, description):
     """Demo a specific scenario."""
-    print(f"\n🎭 SCENARIO: {name}")
-    print("=" * 60)
-    print(f"📝 Description: {description}")
-    print(f"👤 USER INPUT: {user_input}")
-    print()
+    # Each block below is collected and written with a single call
+    sys.stdout.write(
+        f"\n🎭 SCENARIO: {name}\n"
+        f"{'=' * 60}\n"
+        f"📝 Description: {description}\n"
+        f"👤 USER INPUT: {user_input}\n"
+        "\n"
+    )
     
     # Start session
     session_id = conversation_manager.start_new_session()
@@ -30,37 +36,40 @@ def demo_scenario(name, user_input, description):
     processing_time = time.time() - start_time
     
     # Show response
-    print("🤖 CHATBOT RESPONSE:")
-    print("-" * 50)
-    print(response)
-    print("-" * 50)
-    
-    # Show analysis
     session = conversation_manager.active_sessions[session_id]
     latest_message = session.messages[-1]
     
-    print(f"\n🔍 SYSTEM ANALYSIS:")
-    print(f"   ⚡ Response Time: {processing_time:.2f} seconds")
-    print(f"   🧠 LLM Used: No (Rule-based fallback)")
-    print(f"   🚨 Crisis Detected: {'YES' if is_crisis else 'No'}")
-    print(f"   📊 Severity Level: {latest_message.severity_assessment.value.upper()}")
-    print(f"   🔍 Detected Keywords: {latest_message.detected_keywords}")
-    print(f"   🎯 Identified Concerns: {session.identified_concerns}")
-    print(f"   📋 Resources Recommended: {len(session.recommended_resources)}")
+    lines = [
+        "🤖 CHATBOT RESPONSE:",
+        "-" * 50,
+        response,
+        "-" * 50,
+        # Show analysis
+        "\n🔍 SYSTEM ANALYSIS:",
+        f"   ⚡ Response Time: {processing_time:.2f} seconds",
+        "   🧠 LLM Used: No (Rule-based fallback)",
+        f"   🚨 Crisis Detected: {'YES' if is_crisis else 'No'}",
+        f"   📊 Severity Level: {latest_message.severity_assessment.value.upper()}",
+        f"   🔍 Detected Keywords: {latest_message.detected_keywords}",
+        f"   🎯 Identified Concerns: {session.identified_concerns}",
+        f"   📋 Resources Recommended: {len(session.recommended_resources)}"
+    ]
     
     # Show recommended resources
     if session.recommended_resources:
-        print(f"\n📋 RECOMMENDED RESOURCES:")
+        lines.append("\n📋 RECOMMENDED RESOURCES:")
         for i, resource_id in enumerate(session.recommended_resources[:3], 1):
             resource = resource_db.get_resource(resource_id)
             if resource:
-                contact = resource.contact_info.get('phone', 
-                         resource.contact_info.get('website', 
-                         resource.contact_info.get('email', 'Contact available')))
-                print(f"   {i}. {resource.name}")
-                print(f"      📞 Contact: {contact}")
-                print(f"      🏷️  Type: {resource.resource_type.value}")
-                print(f"      💰 Cost: {resource.cost}")
+                contact = resource.primary_contact
+                lines.append(
+                    f"   {i}. {resource.name}\n"
+                    f"      📞 Contact: {contact}\n"
+                    f"      🏷️  Type: {resource.resource_type.value}\n"
+                    f"      💰 Cost: {resource.cost}"
+                )
+    
+    sys.stdout.write("\n".join(lines) + "\n")
     
     # Clean up
     conversation_manager.end_session(session_id)
@@ -105,7 +114,8 @@ def main():
         demo_scenario(scenario["name"], scenario["input"], scenario["description"])
         
         # Pause between scenarios
-        input("Press Enter to continue to next scenario...")
+        if INTERACTIVE:
+            input("Press Enter to continue to next scenario...")
     
     print("\n🎉 DEMONSTRATION COMPLETE!")
     print("=" * 70)
@@ -1,6 +1,10 @@
 """Core domain logic for matching user situations to mental health resources."""
 
-from typing import List, Dict, Tuple, Optional
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
+from typing import List, Dict, FrozenSet, Iterable, Tuple, Optional, Sequence
 from data_models import (
     MentalHealthScenario, Resource, Recommendation, UserMessage, 
     SeverityLevel, CrisisAssessment
@@ -8,9 +12,38 @@ from data_models import (
 from scenario_data import scenario_db
 from resource_database import resource_db
 from crisis_handler import crisis_handler
-from utils.text_processing import text_processor
+from utils.text_processing import TextAnalysis, text_processor
 from utils.logger import logger
 
+_get_id = attrgetter('id')
+_get_resource_name = attrgetter('resource_name')
+
+_HIGH_RISK_LEVELS = frozenset({SeverityLevel.HIGH, SeverityLevel.CRISIS})
+
+# Resources suggested for each concern category, in display order
+_CATEGORY_RESOURCE_IDS: Dict[str, Tuple[str, ...]] = {
+    'academic_stress': ('northeastern_academic_support', 'mindbridge_academic_coaching'),
+    'social_isolation': ('northeastern_peer_support', 'mindbridge_peer_support'),
+    'cultural_adjustment': ('northeastern_international', 'mindbridge_counseling'),
+    'self_esteem': ('northeastern_counseling', 'mindbridge_counseling'),
+    'crisis': ('crisis_hotline', 'northeastern_emergency', 'mindbridge_crisis_support'),
+    'anxiety': ('northeastern_counseling', 'mindbridge_counseling'),
+    'family_relationships': ('northeastern_counseling', 'mindbridge_counseling'),
+    'financial_stress': ('northeastern_academic_support', 'mindbridge_wellness_programs')
+}
+
+# Always offered when not already recommended
+_GENERAL_COUNSELING_IDS = ('northeastern_counseling', 'mindbridge_counseling')
+
+# Reasoning shown for contextual recommendations, by primary category
+_CATEGORY_DESCRIPTIONS = {
+    'social_isolation': 'loneliness and social isolation',
+    'academic_stress': 'exam anxiety and academic pressure', 
+    'cultural_adjustment': 'international student support and cultural adjustment',
+    'self_esteem': 'self-esteem and confidence building',
+    'crisis': 'crisis intervention and immediate support'
+}
+
 class MentalHealthMatcher:
     """Core logic for matching user needs to appropriate resources and scenarios."""
     
@@ -21,21 +54,93 @@ class MentalHealthMatcher:
             SeverityLevel.MODERATE: 0.6,
             SeverityLevel.LOW: 0.4
         }
+        
+        # Severity-match part of scenario relevance for every
+        # (scenario severity, user severity) pair
+        self._severity_scores: Dict[Tuple[SeverityLevel, SeverityLevel], float] = {
+            (scenario_severity, user_severity): (
+                1.0 - abs(self.scenario_weights.get(scenario_severity, 0.5) -
+                          self.scenario_weights.get(user_severity, 0.5))
+            ) * 0.3
+            for scenario_severity in SeverityLevel
+            for user_severity in SeverityLevel
+        }
+        
+        # Scenario keywords lowercased once, for relevance scoring
+        self._scenario_keywords: Dict[str, Tuple[str, ...]] = {
+            scenario_id: tuple(k.lower() for k in scenario.keywords)
+            for scenario_id, scenario in scenario_db.scenarios.items()
+        }
+        
+        # Static part of each resource's relevance, as (score, score for a
+        # high-risk user), plus the lowercased text keywords are matched in
+        self._resource_features: Dict[str, Tuple[Tuple[float, float], str]] = {
+            resource_id: self._compute_resource_features(resource)
+            for resource_id, resource in resource_db.resources.items()
+        }
+        
+        # Inverted indexes: user keyword -> ids of scenarios with an overlapping
+        # keyword, and -> ids of resources whose text contains it. Seeded with
+        # the text processor's vocabulary (where every extracted keyword comes
+        # from) and filled lazily for anything else.
+        self._keyword_scenarios: Dict[str, FrozenSet[str]] = {}
+        self._keyword_resources: Dict[str, FrozenSet[str]] = {}
+        for keyword in (text_processor.crisis_keywords | text_processor.high_severity_keywords |
+                        text_processor.moderate_severity_keywords | text_processor.academic_keywords |
+                        text_processor.social_keywords | text_processor.international_keywords):
+            self._scenarios_for_keyword(keyword.lower())
+            self._resources_for_keyword(keyword.lower())
+        
+        # Category resources resolved once, skipping ids missing from the database
+        self._category_resources: Dict[str, Tuple[Resource, ...]] = {
+            category: tuple(resource for resource in map(resource_db.get_resource, resource_ids)
+                            if resource)
+            for category, resource_ids in _CATEGORY_RESOURCE_IDS.items()
+        }
+        
+        # Text analysis is deterministic on the cleaned input, so repeated
+        # phrases skip keyword extraction and scenario scoring
+        self._cached_analyze_text = lru_cache(maxsize=1024)(self._analyze_text)
+    
+    def _scenarios_for_keyword(self, keyword: str) -> FrozenSet[str]:
+        """Ids of scenarios whose keywords contain, or are contained in, ``keyword``."""
+        scenario_ids = self._keyword_scenarios.get(keyword)
+        if scenario_ids is None:
+            scenario_ids = frozenset(
+                scenario_id for scenario_id, scenario_keywords in self._scenario_keywords.items()
+                if any(k in keyword or keyword in k for k in scenario_keywords)
+            )
+            self._keyword_scenarios[keyword] = scenario_ids
+        return scenario_ids
+    
+    def _resources_for_keyword(self, keyword: str) -> FrozenSet[str]:
+        """Ids of database resources whose name or description contains ``keyword``."""
+        resource_ids = self._keyword_resources.get(keyword)
+        if resource_ids is None:
+            resource_ids = frozenset(
+                resource_id for resource_id, (_, resource_text) in self._resource_features.items()
+                if keyword in resource_text
+            )
+            self._keyword_resources[keyword] = resource_ids
+        return resource_ids
     
-    def analyze_user_input(self, user_input: str, conversation_history: List[str] = None) -> Dict:
+    def analyze_user_input(self, user_input: str, conversation_history: Sequence[str] = None) -> Dict:
         """Comprehensive analysis of user input to determine appropriate response."""
-        # Clean and process text
         cleaned_input = text_processor.clean_text(user_input)
-        keywords = text_processor.extract_keywords(cleaned_input)
-        severity = text_processor.assess_severity(cleaned_input, keywords)
-        categories = text_processor.categorize_concern(cleaned_input, keywords)
-        emotions = text_processor.extract_emotions(cleaned_input)
+        text, cached_scenarios = self._cached_analyze_text(cleaned_input)
         
-        # Crisis assessment
-        crisis_assessment = crisis_handler.assess_crisis_risk(cleaned_input, conversation_history)
+        # Crisis assessment depends on the history and logs, so it stays
+        # outside the cache (its own keyword scoring is cached)
+        crisis_assessment = crisis_handler.assess_crisis_risk(
+            cleaned_input, conversation_history, text.text_lower
+        )
         
-        # Find matching scenarios
-        matching_scenarios = self._find_matching_scenarios(keywords, categories, severity)
+        # Callers keep and extend these, so hand out fresh lists
+        keywords = list(text.keywords)
+        severity = text.severity
+        categories = list(text.categories)
+        emotions = list(text.emotions)
+        matching_scenarios = list(cached_scenarios)
         
         # Generate resource recommendations
         recommendations = self._generate_recommendations(
@@ -64,16 +169,33 @@ class MentalHealthMatcher:
         
         return analysis
     
+    def prewarm(self, user_inputs: Iterable[str]) -> None:
+        """Analyze known inputs ahead of time so later messages hit the cache."""
+        for user_input in user_inputs:
+            self._cached_analyze_text(text_processor.clean_text(user_input))
+    
+    def _analyze_text(self, cleaned_input: str) -> Tuple[TextAnalysis, Tuple[MentalHealthScenario, ...]]:
+        """Text analysis of cleaned input and the scenarios it matches."""
+        text = text_processor.analyze(cleaned_input)
+        matching_scenarios = self._find_matching_scenarios(text.keywords, text.categories, text.severity)
+        return text, tuple(matching_scenarios)
+    
     def _find_matching_scenarios(self, keywords: List[str], categories: List[str], 
                                 severity: SeverityLevel) -> List[MentalHealthScenario]:
         """Find scenarios that match user input."""
         matching_scenarios = []
+        keywords_lower = [keyword.lower() for keyword in keywords]
+        
+        # Keyword hits for every indexed scenario, counted in one pass
+        keyword_hits = Counter(chain.from_iterable(map(self._scenarios_for_keyword, keywords_lower)))
         
         # First, try to match by keywords
         for category in categories:
             category_scenarios = scenario_db.get_scenarios_by_category(category)
             for scenario in category_scenarios:
-                relevance_score = self._calculate_scenario_relevance(scenario, keywords, severity)
+                relevance_score = self._calculate_scenario_relevance(
+                    scenario, keywords_lower, severity, keyword_hits[scenario.id]
+                )
                 if relevance_score > 0.3:  # Threshold for relevance
                     matching_scenarios.append((scenario, relevance_score))
         
@@ -81,7 +203,9 @@ class MentalHealthMatcher:
         if not matching_scenarios:
             all_matching = scenario_db.find_matching_scenarios(keywords)
             for scenario in all_matching[:3]:  # Top 3 matches
-                relevance_score = self._calculate_scenario_relevance(scenario, keywords, severity)
+                relevance_score = self._calculate_scenario_relevance(
+                    scenario, keywords_lower, severity, keyword_hits[scenario.id]
+                )
                 matching_scenarios.append((scenario, relevance_score))
         
         # Sort by relevance score and return scenarios
@@ -89,22 +213,29 @@ class MentalHealthMatcher:
         return [scenario for scenario, _ in matching_scenarios[:5]]  # Top 5 scenarios
     
     def _calculate_scenario_relevance(self, scenario: MentalHealthScenario, 
-                                    keywords: List[str], severity: SeverityLevel) -> float:
-        """Calculate how relevant a scenario is to the user input."""
+                                    keywords: List[str], severity: SeverityLevel,
+                                    keyword_matches: Optional[int] = None) -> float:
+        """Calculate how relevant a scenario is to the user input.
+        
+        ``keywords`` are expected to be lowercased already. Callers scoring
+        many scenarios can pass the indexed ``keyword_matches`` count.
+        """
         relevance_score = 0.0
         
         # Keyword matching (40% of score)
-        keyword_matches = sum(1 for keyword in keywords 
-                            if any(k.lower() in keyword.lower() or keyword.lower() in k.lower() 
-                                  for k in scenario.keywords))
+        if scenario.id in self._scenario_keywords:
+            if keyword_matches is None:
+                keyword_matches = sum(1 for keyword in keywords
+                                    if scenario.id in self._scenarios_for_keyword(keyword))
+        else:
+            scenario_keywords = tuple(k.lower() for k in scenario.keywords)
+            keyword_matches = sum(1 for keyword in keywords 
+                                if any(k in keyword or keyword in k for k in scenario_keywords))
         keyword_score = min(keyword_matches / len(scenario.keywords), 1.0) * 0.4
         relevance_score += keyword_score
         
         # Severity matching (30% of score)
-        severity_weight = self.scenario_weights.get(scenario.severity, 0.5)
-        user_severity_weight = self.scenario_weights.get(severity, 0.5)
-        severity_score = (1.0 - abs(severity_weight - user_severity_weight)) * 0.3
-        relevance_score += severity_score
+        relevance_score += self._severity_scores[scenario.severity, severity]
         
         # Category bonus (30% of score)
         # This would be calculated based on category matching in the calling function
@@ -118,17 +249,18 @@ class MentalHealthMatcher:
                                 crisis_assessment: CrisisAssessment) -> List[Recommendation]:
         """Generate personalized resource recommendations."""
         recommendations = []
+        seen_ids = set()  # Resource ids already in recommendations
         
         # Crisis resources always come first
         if crisis_assessment.requires_immediate_intervention:
             crisis_resources = resource_db.get_crisis_resources()
-            for i, resource in enumerate(crisis_resources[:3]):
+            for resource in crisis_resources[:3]:
+                seen_ids.add(resource.id)
                 recommendations.append(Recommendation(
                     resource_id=resource.id,
                     resource_name=resource.name,
                     relevance_score=1.0,
                     reasoning="Immediate crisis support needed",
-                    priority=i + 1,
                     is_immediate=True,
                     follow_up_actions=["Contact immediately", "Ensure safety"]
                 ))
@@ -137,7 +269,8 @@ class MentalHealthMatcher:
         for scenario in scenarios[:2]:  # Top 2 scenarios
             scenario_resources = resource_db.get_recommended_resources_for_scenario(scenario.id)
             for resource in scenario_resources:
-                if not any(r.resource_id == resource.id for r in recommendations):
+                if resource.id not in seen_ids:
+                    seen_ids.add(resource.id)
                     relevance_score = self._calculate_resource_relevance(
                         resource, keywords, categories, severity
                     )
@@ -146,14 +279,14 @@ class MentalHealthMatcher:
                         resource_name=resource.name,
                         relevance_score=relevance_score,
                         reasoning=f"Recommended for {scenario.title.lower()}",
-                        priority=len(recommendations) + 1,
                         follow_up_actions=self._get_follow_up_actions(resource, severity)
                     ))
         
         # Category-based recommendations
         category_resources = self._get_category_resources(categories, severity)
         for resource in category_resources:
-            if not any(r.resource_id == resource.id for r in recommendations):
+            if resource.id not in seen_ids:
+                seen_ids.add(resource.id)
                 relevance_score = self._calculate_resource_relevance(
                     resource, keywords, categories, severity
                 )
@@ -162,74 +295,80 @@ class MentalHealthMatcher:
                     resource_name=resource.name,
                     relevance_score=relevance_score,
                     reasoning=f"Relevant for {', '.join(categories)}",
-                    priority=len(recommendations) + 1,
                     follow_up_actions=self._get_follow_up_actions(resource, severity)
                 ))
         
         # Always include general counseling if not already present
-        general_counseling = ["northeastern_counseling", "mindbridge_counseling"]
-        for resource_id in general_counseling:
-            if not any(r.resource_id == resource_id for r in recommendations):
+        for resource_id in _GENERAL_COUNSELING_IDS:
+            if resource_id not in seen_ids:
                 resource = resource_db.get_resource(resource_id)
                 if resource:
+                    seen_ids.add(resource.id)
                     recommendations.append(Recommendation(
                         resource_id=resource.id,
                         resource_name=resource.name,
                         relevance_score=0.7,
                         reasoning="General mental health support",
-                        priority=len(recommendations) + 1,
                         follow_up_actions=["Schedule appointment", "Discuss concerns"]
                     ))
         
-        # Sort by priority and relevance
-        recommendations.sort(key=lambda r: (r.priority, -r.relevance_score))
-        
+        # Priority is the position in the list, which is already in
+        # recommendation order, so number only the ones that are kept
         logger.log_resource_recommendation("current", len(recommendations))
-        return recommendations[:6]  # Top 6 recommendations
+        top_recommendations = recommendations[:6]  # Top 6 recommendations
+        for priority, recommendation in enumerate(top_recommendations, 1):
+            recommendation.priority = priority
+        return top_recommendations
+    
+    @staticmethod
+    def _compute_resource_features(resource: Resource) -> Tuple[Tuple[float, float], str]:
+        """Precompute the keyword-independent parts of resource relevance."""
+        base_scores = []
+        for high_risk in (False, True):
+            relevance_score = 0.5  # Base score
+            
+            # Crisis resources get highest priority for high severity
+            if resource.is_crisis_resource and high_risk:
+                relevance_score += 0.4
+            
+            # MindBridge resources get bonus for comprehensive care
+            if "mindbridge" in resource.id.lower():
+                relevance_score += 0.2
+            
+            # Northeastern resources get bonus for accessibility
+            if "northeastern" in resource.id.lower():
+                relevance_score += 0.1
+            
+            base_scores.append(relevance_score)
+        
+        resource_text = f"{resource.name} {resource.description}".lower()
+        return (base_scores[0], base_scores[1]), resource_text
     
     def _calculate_resource_relevance(self, resource: Resource, keywords: List[str],
                                     categories: List[str], severity: SeverityLevel) -> float:
         """Calculate how relevant a resource is to the user's needs."""
-        relevance_score = 0.5  # Base score
-        
-        # Crisis resources get highest priority for high severity
-        if resource.is_crisis_resource and severity in [SeverityLevel.HIGH, SeverityLevel.CRISIS]:
-            relevance_score += 0.4
-        
-        # MindBridge resources get bonus for comprehensive care
-        if "mindbridge" in resource.id.lower():
-            relevance_score += 0.2
-        
-        # Northeastern resources get bonus for accessibility
-        if "northeastern" in resource.id.lower():
-            relevance_score += 0.1
+        features = self._resource_features.get(resource.id)
+        base_scores, resource_text = features or self._compute_resource_features(resource)
+        relevance_score = base_scores[severity in _HIGH_RISK_LEVELS]
         
         # Keyword matching in resource description
-        resource_text = f"{resource.name} {resource.description}".lower()
-        keyword_matches = sum(1 for keyword in keywords if keyword.lower() in resource_text)
+        if features is None:
+            keyword_matches = sum(1 for keyword in keywords if keyword.lower() in resource_text)
+        else:
+            keyword_matches = sum(1 for keyword in keywords
+                                if resource.id in self._resources_for_keyword(keyword.lower()))
         relevance_score += min(keyword_matches * 0.1, 0.3)
         
         return min(relevance_score, 1.0)
     
     def _get_category_resources(self, categories: List[str], severity: SeverityLevel) -> List[Resource]:
         """Get resources relevant to specific categories."""
-        category_resource_mapping = {
-            'academic_stress': ['northeastern_academic_support', 'mindbridge_academic_coaching'],
-            'social_isolation': ['northeastern_peer_support', 'mindbridge_peer_support'],
-            'cultural_adjustment': ['northeastern_international', 'mindbridge_counseling'],
-            'self_esteem': ['northeastern_counseling', 'mindbridge_counseling'],
-            'crisis': ['crisis_hotline', 'northeastern_emergency', 'mindbridge_crisis_support'],
-            'anxiety': ['northeastern_counseling', 'mindbridge_counseling'],
-            'family_relationships': ['northeastern_counseling', 'mindbridge_counseling'],
-            'financial_stress': ['northeastern_academic_support', 'mindbridge_wellness_programs']
-        }
-        
         resources = []
+        seen_ids = set()
         for category in categories:
-            resource_ids = category_resource_mapping.get(category, [])
-            for resource_id in resource_ids:
-                resource = resource_db.get_resource(resource_id)
-                if resource and resource not in resources:
+            for resource in self._category_resources.get(category, ()):
+                if resource.id not in seen_ids:
+                    seen_ids.add(resource.id)
                     resources.append(resource)
         
         return resources
@@ -250,8 +389,8 @@ class MentalHealthMatcher:
         return {
             'severity': analysis['severity'].value,
             'categories': analysis['categories'],
-            'matched_scenarios': [s.id for s in analysis['matching_scenarios']],
-            'recommended_resources': [r.resource_name for r in analysis['recommendations'][:3]],
+            'matched_scenarios': list(map(_get_id, analysis['matching_scenarios'])),
+            'recommended_resources': list(map(_get_resource_name, analysis['recommendations'][:3])),
             'emotions': analysis['emotions'],
             'crisis_detected': analysis['requires_immediate_attention']
         }
@@ -261,21 +400,22 @@ class MentalHealthMatcher:
         if not recommendations:
             return "I'd recommend reaching out to Northeastern CAPS at (617) 373-2772 or MindBridge Care at 1-800-MINDBRIDGE for personalized support."
         
+        shown = recommendations[:4]  # Top 4 for display
+        resources = resource_db.get_many(rec.resource_id for rec in shown)
         formatted_parts = ["**Recommended Resources:**\n"]
         
-        for i, rec in enumerate(recommendations[:4], 1):  # Top 4 for display
-            resource = resource_db.get_resource(rec.resource_id)
+        for i, rec in enumerate(shown, 1):
+            resource = resources.get(rec.resource_id)
             if resource:
                 priority_indicator = "🚨" if rec.is_immediate else f"{i}."
-                formatted_parts.append(f"{priority_indicator} **{resource.name}**")
-                
-                if resource.contact_info.get('phone'):
-                    formatted_parts.append(f"   📞 {resource.contact_info['phone']}")
-                if resource.contact_info.get('website'):
-                    formatted_parts.append(f"   🌐 {resource.contact_info['website']}")
-                
-                formatted_parts.append(f"   *{rec.reasoning}*")
-                formatted_parts.append("")
+                phone = resource.contact_info.get('phone')
+                website = resource.contact_info.get('website')
+                phone_line = f"\n   📞 {phone}" if phone else ""
+                website_line = f"\n   🌐 {website}" if website else ""
+                formatted_parts.append(
+                    f"{priority_indicator} **{resource.name}**{phone_line}{website_line}\n"
+                    f"   *{rec.reasoning}*\n"
+                )
         
         return "\n".join(formatted_parts)
     
@@ -286,24 +426,16 @@ class MentalHealthMatcher:
         # Get resources for the conversation context categories
         context_resources = self._get_category_resources(categories, severity)
         
+        # Determine reasoning based on primary category
+        primary_category = categories[0] if categories else 'general_mental_health'
+        reasoning = _CATEGORY_DESCRIPTIONS.get(primary_category, 'general mental health support')
+        
         # Generate recommendations from context resources
         for i, resource in enumerate(context_resources[:6]):  # Limit to 6 resources
             relevance_score = self._calculate_resource_relevance(
                 resource, [], categories, severity  # Empty keywords since we're using context
             )
             
-            # Determine reasoning based on primary category
-            primary_category = categories[0] if categories else 'general_mental_health'
-            category_descriptions = {
-                'social_isolation': 'loneliness and social isolation',
-                'academic_stress': 'exam anxiety and academic pressure', 
-                'cultural_adjustment': 'international student support and cultural adjustment',
-                'self_esteem': 'self-esteem and confidence building',
-                'crisis': 'crisis intervention and immediate support'
-            }
-            
-            reasoning = category_descriptions.get(primary_category, 'general mental health support')
-            
             recommendations.append(Recommendation(
                 resource_id=resource.id,
                 resource_name=resource.name,
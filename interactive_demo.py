@@ -19,11 +19,36 @@ import time
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from conversation_flow import conversation_manager
+from domain_logic import mental_health_matcher
 from resource_database import resource_db
 from config import config
 from llm_client import llm_client
 from utils.logger import logger
 
+# Canned prompts offered by run_demo_scenarios
+DEMO_SCENARIOS = (
+    {
+        "name": "Academic Stress",
+        "input": "I'm really stressed about my upcoming finals. I can't sleep and I'm worried I'll fail everything.",
+        "description": "Tests academic stress detection and resource recommendations"
+    },
+    {
+        "name": "Social Isolation", 
+        "input": "I feel so lonely at college. I don't have any friends and spend all my time alone in my room.",
+        "description": "Tests social isolation detection and peer support resources"
+    },
+    {
+        "name": "International Student",
+        "input": "I'm an international student and I'm really homesick. Everything feels so different here and I miss my family.",
+        "description": "Tests international student support and cultural resources"
+    },
+    {
+        "name": "Crisis Situation",
+        "input": "I can't take this anymore. I've been thinking about ending it all. Nothing seems worth it.",
+        "description": "Tests crisis detection and immediate intervention protocols"
+    }
+)
+
 class InteractiveDemo:
     """Interactive demonstration of the XN Mental Health Chatbot."""
     
@@ -31,6 +56,9 @@ class InteractiveDemo:
         self.session_id = None
         self.api_key_set = False
         
+        # Analyze the canned prompts up front so picking one responds at once
+        mental_health_matcher.prewarm(scenario["input"] for scenario in DEMO_SCENARIOS)
+        
     def setup_api_key(self):
         """Set up Gemini API key for the demo."""
         print("🔑 GEMINI API KEY SETUP")
@@ -118,9 +146,7 @@ class InteractiveDemo:
             for i, resource_id in enumerate(session.recommended_resources[:3], 1):
                 resource = resource_db.get_resource(resource_id)
                 if resource:
-                    contact = resource.contact_info.get('phone', 
-                             resource.contact_info.get('website', 
-                             resource.contact_info.get('email', 'Contact available')))
+                    contact = resource.primary_contact
                     print(f"   {i}. {resource.name}")
                     print(f"      Contact: {contact}")
                     print(f"      Type: {resource.resource_type.value}")
@@ -129,28 +155,7 @@ class InteractiveDemo:
         
     def run_demo_scenarios(self):
         """Run predefined demo scenarios."""
-        scenarios = [
-            {
-                "name": "Academic Stress",
-                "input": "I'm really stressed about my upcoming finals. I can't sleep and I'm worried I'll fail everything.",
-                "description": "Tests academic stress detection and resource recommendations"
-            },
-            {
-                "name": "Social Isolation", 
-                "input": "I feel so lonely at college. I don't have any friends and spend all my time alone in my room.",
-                "description": "Tests social isolation detection and peer support resources"
-            },
-            {
-                "name": "International Student",
-                "input": "I'm an international student and I'm really homesick. Everything feels so different here and I miss my family.",
-                "description": "Tests international student support and cultural resources"
-            },
-            {
-                "name": "Crisis Situation",
-                "input": "I can't take this anymore. I've been thinking about ending it all. Nothing seems worth it.",
-                "description": "Tests crisis detection and immediate intervention protocols"
-            }
-        ]
+        scenarios = DEMO_SCENARIOS
         
         print("\n🎭 DEMO SCENARIOS")
         print("=" * 50)
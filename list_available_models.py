@@ -3,6 +3,19 @@
 List available Gemini models for your API key
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
+TEST_MODELS = ['gemini-1.5-flash', 'gemini-1.5-pro', 'gemini-pro', 'models/gemini-1.5-flash', 'models/gemini-1.5-pro']
+
+def _probe_model(genai, model_name):
+    """Try a tiny generation with one model; return (name, error or None)."""
+    try:
+        test_model = genai.GenerativeModel(model_name)
+        test_model.generate_content("Hello", generation_config={'max_output_tokens': 5})
+        return model_name, None
+    except Exception as e:
+        return model_name, str(e)
+
 def list_models(api_key):
     """List all available models for the given API key."""
     print(f"🔍 Checking available models for API key: {api_key[:10]}...{api_key[-4:]}")
@@ -24,17 +37,17 @@ def list_models(api_key):
                     print(f"     ❌ Does not support generateContent")
             print()
             
-        # Test the most common ones
-        test_models = ['gemini-1.5-flash', 'gemini-1.5-pro', 'gemini-pro', 'models/gemini-1.5-flash', 'models/gemini-1.5-pro']
-        
+        # Test the most common ones; the probes are independent network
+        # calls, so run them together and report in the original order
         print("🧪 Testing common model names:")
-        for model_name in test_models:
-            try:
-                test_model = genai.GenerativeModel(model_name)
-                response = test_model.generate_content("Hello", generation_config={'max_output_tokens': 5})
+        with ThreadPoolExecutor(max_workers=len(TEST_MODELS)) as executor:
+            results = list(executor.map(lambda name: _probe_model(genai, name), TEST_MODELS))
+        
+        for model_name, error in results:
+            if error is None:
                 print(f"   ✅ {model_name}: WORKS")
-            except Exception as e:
-                print(f"   ❌ {model_name}: {str(e)[:100]}")
+            else:
+                print(f"   ❌ {model_name}: {error[:100]}")
                 
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -31,12 +31,15 @@ Let's start: **What city or zip code are you located in?** (This helps me find p
 
 *You can also say "telehealth only" if you prefer online appointments.*"""
     
-    def process_location_response(self, session_id: str, user_input: str) -> str:
+    def process_location_response(self, session_id: str, user_input: str,
+                                  user_input_lower: Optional[str] = None) -> str:
         """Process user's location input."""
         state = self.conversation_state.get(session_id, {})
         preferences = state.get("preferences", UserPreferences())
         
-        user_input_lower = user_input.lower().strip()
+        if user_input_lower is None:
+            user_input_lower = user_input.lower()
+        user_input_lower = user_input_lower.strip()
         
         if "telehealth" in user_input_lower or "online" in user_input_lower:
             preferences.telehealth_preference = "required"
@@ -68,12 +71,15 @@ Just tell me your insurance name or say "not sure" if you need help figuring it
         self.conversation_state[session_id] = state
         return next_response
     
-    def process_insurance_response(self, session_id: str, user_input: str) -> str:
+    def process_insurance_response(self, session_id: str, user_input: str,
+                                   user_input_lower: Optional[str] = None) -> str:
         """Process user's insurance input."""
         state = self.conversation_state.get(session_id, {})
         preferences = state.get("preferences", UserPreferences())
         
-        user_input_lower = user_input.lower().strip()
+        if user_input_lower is None:
+            user_input_lower = user_input.lower()
+        user_input_lower = user_input_lower.strip()
         
         # Map common insurance variations
         insurance_mapping = {
@@ -115,12 +121,15 @@ What sounds most helpful for your situation?"""
         self.conversation_state[session_id] = state
         return next_response
     
-    def process_care_type_response(self, session_id: str, user_input: str) -> str:
+    def process_care_type_response(self, session_id: str, user_input: str,
+                                   user_input_lower: Optional[str] = None) -> str:
         """Process user's care type preference."""
         state = self.conversation_state.get(session_id, {})
         preferences = state.get("preferences", UserPreferences())
         
-        user_input_lower = user_input.lower().strip()
+        if user_input_lower is None:
+            user_input_lower = user_input.lower()
+        user_input_lower = user_input_lower.strip()
         
         if "therapy" in user_input_lower or "counseling" in user_input_lower:
             preferences.preferred_provider_type = ["therapist", "counselor", "LCSW", "LMHC"]
@@ -154,12 +163,15 @@ You can mention multiple areas, or say "no specific preference" if you're open t
         self.conversation_state[session_id] = state
         return next_response
     
-    def process_specialties_response(self, session_id: str, user_input: str) -> str:
+    def process_specialties_response(self, session_id: str, user_input: str,
+                                     user_input_lower: Optional[str] = None) -> str:
         """Process user's specialty preferences."""
         state = self.conversation_state.get(session_id, {})
         preferences = state.get("preferences", UserPreferences())
         
-        user_input_lower = user_input.lower().strip()
+        if user_input_lower is None:
+            user_input_lower = user_input.lower()
+        user_input_lower = user_input_lower.strip()
         
         specialties = []
         specialty_keywords = {
@@ -198,12 +210,15 @@ You can answer all at once or say "no other preferences" to see your recommendat
         self.conversation_state[session_id] = state
         return next_response
     
-    def process_final_preferences(self, session_id: str, user_input: str) -> str:
+    def process_final_preferences(self, session_id: str, user_input: str,
+                                  user_input_lower: Optional[str] = None) -> str:
         """Process final user preferences and generate recommendations."""
         state = self.conversation_state.get(session_id, {})
         preferences = state.get("preferences", UserPreferences())
         
-        user_input_lower = user_input.lower().strip()
+        if user_input_lower is None:
+            user_input_lower = user_input.lower()
+        user_input_lower = user_input_lower.strip()
         
         # Parse distance preference
         if "mile" in user_input_lower:
@@ -1,6 +1,6 @@
 """Database of mental health resources including MindBridge Care and Northeastern services."""
 
-from typing import Dict, List
+from typing import Dict, Iterable, List, Tuple
 from data_models import Resource, ResourceType
 
 class ResourceDatabase:
@@ -8,6 +8,17 @@ class ResourceDatabase:
     
     def __init__(self):
         self.resources = self._initialize_resources()
+        
+        # The database is static, so the fixed subsets are built once
+        self._crisis_resources = tuple(r for r in self.resources.values() if r.is_crisis_resource)
+        self._mindbridge_resources = tuple(r for r in self.resources.values()
+                                           if r.resource_type == ResourceType.MINDBRIDGE_BENEFIT)
+        self._northeastern_resources = tuple(r for r in self.resources.values()
+                                             if "northeastern" in r.id.lower())
+        
+        # Lowercased name and description that keyword searches run against
+        self._search_texts = {rid: f"{r.name} {r.description}".lower()
+                              for rid, r in self.resources.items()}
     
     def _initialize_resources(self) -> Dict[str, Resource]:
         """Initialize the database with available resources."""
@@ -212,36 +223,40 @@ class ResourceDatabase:
         """Get a specific resource by ID."""
         return self.resources.get(resource_id)
     
-    def get_crisis_resources(self) -> List[Resource]:
+    def get_many(self, resource_ids: Iterable[str]) -> Dict[str, Resource]:
+        """Get the resources for several IDs, skipping unknown ones."""
+        return {rid: self.resources[rid] for rid in resource_ids if rid in self.resources}
+    
+    def get_crisis_resources(self) -> Tuple[Resource, ...]:
         """Get all crisis-level resources."""
-        return [r for r in self.resources.values() if r.is_crisis_resource]
+        return self._crisis_resources
     
     def get_resources_by_type(self, resource_type: ResourceType) -> List[Resource]:
         """Get all resources of a specific type."""
         return [r for r in self.resources.values() if r.resource_type == resource_type]
     
-    def get_mindbridge_resources(self) -> List[Resource]:
+    def get_mindbridge_resources(self) -> Tuple[Resource, ...]:
         """Get all MindBridge Care resources."""
-        return [r for r in self.resources.values() 
-                if r.resource_type == ResourceType.MINDBRIDGE_BENEFIT]
+        return self._mindbridge_resources
     
-    def get_northeastern_resources(self) -> List[Resource]:
+    def get_northeastern_resources(self) -> Tuple[Resource, ...]:
         """Get all Northeastern University resources."""
-        return [r for r in self.resources.values() 
-                if "northeastern" in r.id.lower()]
+        return self._northeastern_resources
     
     def search_resources(self, keywords: List[str], include_crisis: bool = True) -> List[Resource]:
         """Search resources based on keywords."""
         matching_resources = []
         
-        for resource in self.resources.values():
+        keywords_lower = [keyword.lower() for keyword in keywords]
+        
+        for resource_id, resource in self.resources.items():
             # Skip crisis resources if not requested
             if resource.is_crisis_resource and not include_crisis:
                 continue
             
             # Check if any keywords match resource name or description
-            text_to_search = f"{resource.name} {resource.description}".lower()
-            keyword_matches = any(keyword.lower() in text_to_search for keyword in keywords)
+            text_to_search = self._search_texts[resource_id]
+            keyword_matches = any(keyword in text_to_search for keyword in keywords_lower)
             
             if keyword_matches:
                 matching_resources.append(resource)
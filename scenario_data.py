@@ -1,5 +1,6 @@
 """Mental health scenarios database based on college student needs."""
 
+from operator import attrgetter
 from typing import Dict, List
 from data_models import MentalHealthScenario, SeverityLevel
 
@@ -255,14 +256,7 @@ class ScenarioDatabase:
                 matching_scenarios.append(scenario)
         
         # Sort by severity (crisis first, then high, moderate, low)
-        severity_order = {
-            SeverityLevel.CRISIS: 0,
-            SeverityLevel.HIGH: 1,
-            SeverityLevel.MODERATE: 2,
-            SeverityLevel.LOW: 3
-        }
-        
-        matching_scenarios.sort(key=lambda s: severity_order[s.severity])
+        matching_scenarios.sort(key=attrgetter('severity'), reverse=True)
         return matching_scenarios
     
     def get_scenarios_by_category(self, category: str) -> List[MentalHealthScenario]:
@@ -2,7 +2,7 @@
 
 import pytest
 from datetime import datetime, timedelta
-from conversation_flow import conversation_manager
+from conversation_flow import conversation_manager, ConversationManager, _RESPONSE_TYPES
 from data_models import SeverityLevel
 
 class TestConversationManager:
@@ -186,9 +186,64 @@ class TestConversationManager:
             'recommendations': [{'resource_id': 'test'}]
         }
         
-        assert conversation_manager._determine_response_type(crisis_analysis) == "crisis"
-        assert conversation_manager._determine_response_type(high_risk_analysis) == "urgent_support"
-        assert conversation_manager._determine_response_type(normal_analysis) == "resource_recommendation"
+        def response_type(analysis):
+            return _RESPONSE_TYPES[(analysis['requires_immediate_attention'], analysis['severity'],
+                                    bool(analysis['recommendations']))]
+        
+        assert response_type(crisis_analysis) == "crisis"
+        assert response_type(high_risk_analysis) == "urgent_support"
+        assert response_type(normal_analysis) == "resource_recommendation"
+
+    def test_llm_response_cache_reuses_ai_responses(self, monkeypatch):
+        """Test that repeated messages reuse a cached AI response until it expires."""
+        from config import config
+        from llm_client import llm_client
+        
+        monkeypatch.setattr(config, 'ENABLE_LLM', True)
+        monkeypatch.setattr(llm_client, 'client', object())
+        manager = ConversationManager()
+        calls = []
+        
+        def fake_llm_response(user_input, context):
+            calls.append(user_input)
+            return f"AI reply {len(calls)}", "gemini"
+        
+        manager._generate_llm_response_with_debug = fake_llm_response
+        session_id = manager.start_new_session()
+        
+        first, _ = manager.process_user_message(session_id, "I feel lonely at college")
+        repeat, _ = manager.process_user_message(session_id, "I  feel LONELY at college")
+        assert "AI reply 1" in first
+        assert "AI reply 1" in repeat
+        assert len(calls) == 1
+        
+        monkeypatch.setattr(config, 'LLM_CACHE_TTL_SECONDS', 0)
+        expired, _ = manager.process_user_message(session_id, "I feel lonely at college")
+        assert "AI reply 2" in expired
+        assert len(calls) == 2
+    
+    def test_llm_response_cache_skips_fallbacks(self, monkeypatch):
+        """Test that fallback responses are not cached."""
+        from config import config
+        from llm_client import llm_client
+        
+        monkeypatch.setattr(config, 'ENABLE_LLM', True)
+        monkeypatch.setattr(llm_client, 'client', object())
+        manager = ConversationManager()
+        calls = []
+        
+        def fake_fallback_response(user_input, context):
+            calls.append(user_input)
+            return "Rule-based reply", "fallback"
+        
+        manager._generate_llm_response_with_debug = fake_fallback_response
+        session_id = manager.start_new_session()
+        
+        manager.process_user_message(session_id, "I feel lonely at college")
+        manager.process_user_message(session_id, "I feel lonely at college")
+        
+        assert len(calls) == 2
+        assert len(manager._llm_response_cache) == 0
 
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
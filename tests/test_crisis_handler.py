@@ -194,6 +194,26 @@ class TestCrisisHandler:
         # Low-risk contacts should be less urgent
         low_text = ' '.join(low_contacts)
         assert '617' in low_text  # Northeastern CAPS number
+    
+    def test_repeated_assessment_is_independent(self):
+        """Test that repeated inputs reuse scoring but return separate assessments."""
+        first = crisis_handler.assess_crisis_risk("I want to die, please help me")
+        second = crisis_handler.assess_crisis_risk("I want to die, please help me")
+        
+        assert first is not second
+        assert first.risk_level == second.risk_level == SeverityLevel.CRISIS
+        assert first.detected_indicators == second.detected_indicators
+        
+        # Callers may extend the indicator list without affecting later results
+        first.detected_indicators.append("extra")
+        third = crisis_handler.assess_crisis_risk("I want to die, please help me")
+        assert "extra" not in third.detected_indicators
+    
+    def test_history_keyword_split_across_messages(self):
+        """Test that crisis keywords spanning several history messages are detected."""
+        for history in (['I want to end', 'it all'], ['I think I will end', 'it', 'all tonight']):
+            assessment = crisis_handler.assess_crisis_risk("I don't know anymore", history)
+            assert assessment.risk_level == SeverityLevel.CRISIS
 
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
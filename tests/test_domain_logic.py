@@ -104,6 +104,33 @@ class TestMentalHealthMatcher:
         assert 'anxious' in context['emotions']
         assert context['crisis_detected'] is False
 
+    def test_repeated_analysis_is_independent(self):
+        """Test that mutating one analysis does not affect a repeated one."""
+        user_input = "I'm stressed about my exams and feel lonely"
+        first = mental_health_matcher.analyze_user_input(user_input)
+        first['keywords'].append('mutated')
+        first['categories'].clear()
+
+        second = mental_health_matcher.analyze_user_input(user_input)
+
+        assert 'mutated' not in second['keywords']
+        assert 'academic_stress' in second['categories']
+        assert second['crisis_assessment'] is not first['crisis_assessment']
+
+    def test_scenario_relevance_matches_keyword_overlap(self):
+        """Test indexed relevance scoring against a direct keyword scan."""
+        scenario = scenario_db.get_scenario('academic_exam_anxiety')
+        scenario_keywords = [k.lower() for k in scenario.keywords]
+        keywords = ['exam', 'anxious', 'finals week', 'unrelated']
+
+        expected_matches = sum(1 for keyword in keywords
+                               if any(k in keyword or keyword in k for k in scenario_keywords))
+        score = mental_health_matcher._calculate_scenario_relevance(
+            scenario, keywords, scenario.severity
+        )
+
+        assert score == pytest.approx(min(expected_matches / len(scenario_keywords), 1.0) * 0.4 + 0.6)
+
 class TestScenarioDatabase:
     """Test cases for scenario database."""
     
@@ -1,7 +1,10 @@
 """Logging utilities for the XN Mental Health Chatbot."""
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from typing import Optional
 from config import config
@@ -17,7 +20,12 @@ class ChatbotLogger:
             self._setup_handlers()
     
     def _setup_handlers(self):
-        """Set up logging handlers."""
+        """Set up logging handlers.
+        
+        The console handler writes synchronously so log lines stay in order
+        with printed output. File writes go through a queue to a background
+        listener thread, keeping file I/O off the request path.
+        """
         formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
@@ -32,9 +40,16 @@ class ChatbotLogger:
             try:
                 file_handler = logging.FileHandler(config.LOG_FILE)
                 file_handler.setFormatter(formatter)
-                self.logger.addHandler(file_handler)
             except Exception as e:
                 self.logger.warning(f"Could not create file handler: {e}")
+            else:
+                log_queue = queue.SimpleQueue()
+                self.logger.addHandler(QueueHandler(log_queue))
+                self._listener = QueueListener(log_queue, file_handler)
+                self._listener.start()
+                
+                # Drain queued records before the interpreter exits
+                atexit.register(self._listener.stop)
     
     def log_user_interaction(self, session_id: str, interaction_type: str, 
                            severity: Optional[str] = None):
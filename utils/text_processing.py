@@ -1,9 +1,42 @@
 """Text processing utilities for natural language understanding."""
 
 import re
-from typing import List, Dict, Set, Tuple
+from dataclasses import dataclass
+from typing import Iterable, List, Dict, Optional, Set, Tuple
 from data_models import SeverityLevel
 
+@dataclass(frozen=True, slots=True)
+class TextAnalysis:
+    """Results of every text analysis for one input."""
+    text_lower: str
+    keywords: Tuple[str, ...]
+    severity: SeverityLevel
+    categories: Tuple[str, ...]
+    emotions: Tuple[str, ...]
+
+def trie_regex(words: Iterable[str]) -> str:
+    """Build a regex matching any of ``words``, shaped as a prefix trie.
+    
+    Shared prefixes are matched once, so the engine branches per character
+    instead of retrying every word at each position. Where one word is a
+    prefix of another the longer one wins.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End-of-word marker
+    
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+    
+    return build(trie)
+
 class TextProcessor:
     """Handles text analysis and pattern matching for mental health conversations."""
     
@@ -39,9 +72,26 @@ class TextProcessor:
             'visa', 'home country', 'cultural', 'adjustment', 'different culture'
         }
     
-    def extract_keywords(self, text: str) -> List[str]:
-        """Extract relevant keywords from user input."""
+    def analyze(self, text: str) -> TextAnalysis:
+        """Run keyword, severity, category and emotion analysis in one call.
+        
+        The text is lowercased once and the extracted keywords are shared
+        by the severity and category checks.
+        """
         text_lower = text.lower()
+        keywords = self.extract_keywords(text, text_lower)
+        return TextAnalysis(
+            text_lower=text_lower,
+            keywords=tuple(keywords),
+            severity=self.assess_severity(text, keywords, text_lower),
+            categories=tuple(self.categorize_concern(text, keywords, text_lower)),
+            emotions=tuple(self.extract_emotions(text, text_lower)),
+        )
+    
+    def extract_keywords(self, text: str, text_lower: Optional[str] = None) -> List[str]:
+        """Extract relevant keywords from user input."""
+        if text_lower is None:
+            text_lower = text.lower()
         keywords = []
         
         # Check all keyword categories
@@ -57,17 +107,18 @@ class TextProcessor:
         
         return keywords
     
-    def assess_severity(self, text: str, keywords: List[str] = None) -> SeverityLevel:
+    def assess_severity(self, text: str, keywords: List[str] = None,
+                        text_lower: Optional[str] = None) -> SeverityLevel:
         """Assess the severity level of user's mental health concern."""
-        if keywords is None:
-            keywords = self.extract_keywords(text)
+        if text_lower is None:
+            text_lower = text.lower()
         
-        text_lower = text.lower()
+        if keywords is None:
+            keywords = self.extract_keywords(text, text_lower)
         
         # Crisis level detection
-        for crisis_word in self.crisis_keywords:
-            if crisis_word in text_lower:
-                return SeverityLevel.CRISIS
+        if self.contains_crisis_keyword(text_lower):
+            return SeverityLevel.CRISIS
         
         # High severity detection
         high_severity_count = sum(1 for word in self.high_severity_keywords 
@@ -87,12 +138,18 @@ class TextProcessor:
         
         return SeverityLevel.LOW
     
-    def categorize_concern(self, text: str, keywords: List[str] = None) -> List[str]:
+    def contains_crisis_keyword(self, text_lower: str) -> bool:
+        """Check lowercased text for any crisis-level keyword."""
+        return any(crisis_word in text_lower for crisis_word in self.crisis_keywords)
+    
+    def categorize_concern(self, text: str, keywords: List[str] = None,
+                           text_lower: Optional[str] = None) -> List[str]:
         """Categorize the type of mental health concern."""
-        if keywords is None:
-            keywords = self.extract_keywords(text)
+        if text_lower is None:
+            text_lower = text.lower()
         
-        text_lower = text.lower()
+        if keywords is None:
+            keywords = self.extract_keywords(text, text_lower)
         categories = []
         
         # Academic stress
@@ -118,9 +175,10 @@ class TextProcessor:
         
         return categories
     
-    def detect_crisis_indicators(self, text: str) -> Tuple[bool, List[str]]:
+    def detect_crisis_indicators(self, text: str, text_lower: Optional[str] = None) -> Tuple[bool, List[str]]:
         """Detect specific crisis indicators in text."""
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         detected_indicators = []
         
         crisis_patterns = [
@@ -147,7 +205,7 @@ class TextProcessor:
         
         return text
     
-    def extract_emotions(self, text: str) -> List[str]:
+    def extract_emotions(self, text: str, text_lower: Optional[str] = None) -> List[str]:
         """Extract emotional indicators from text."""
         emotion_keywords = {
             'sad': ['sad', 'sadness', 'down', 'blue', 'melancholy'],
@@ -158,7 +216,8 @@ class TextProcessor:
             'hopeless': ['hopeless', 'helpless', 'stuck', 'trapped', 'no way out']
         }
         
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         detected_emotions = []
         
         for emotion, keywords in emotion_keywords.items():
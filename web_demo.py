@@ -190,9 +190,7 @@ def chat():
         for resource_id in conv_session.recommended_resources[:5]:  # Top 5
             resource = resource_db.get_resource(resource_id)
             if resource:
-                contact = resource.contact_info.get('phone', 
-                         resource.contact_info.get('website', 
-                         resource.contact_info.get('email', 'Contact available')))
+                contact = resource.primary_contact
                 resources.append({
                     'name': resource.name,
                     'contact': contact,